@@ -7,7 +7,7 @@ The agent uses LangGraph for conversation management and provides real-time data
 
 from .main_agent import DatabaseAgent
 from .system_prompts import SYSTEM_PROMPT, HELP_TEXT
-from .config import DatabaseConfig, AgentConfig
+from .config import DatabaseConfig, AgentConfig, get_config, dispose_engine
 from .tools import DatabaseTools
 
 __version__ = "1.0.0"
@@ -17,6 +17,8 @@ __all__ = [
     "DatabaseAgent",
     "DatabaseConfig", 
     "AgentConfig",
+    "get_config",
+    "dispose_engine",
     "DatabaseTools",
     "SYSTEM_PROMPT",
     "HELP_TEXT"
@@ -0,0 +1,107 @@
+"""
+Request batching for LLM calls.
+
+This module collects LLM calls made concurrently by different conversations
+and sends them together through a runnable's abatch.
+"""
+
+import asyncio
+from typing import Any, List, Optional, Set, Tuple
+
+
+class LLMBatcher:
+    """Micro-batcher that groups concurrent calls to a runnable into one abatch call."""
+
+    def __init__(self, runnable, max_batch_size: int = 16, window: float = 0.02, max_concurrency: int = 16):
+        """
+        Initialize the batcher.
+
+        Args:
+            runnable: LangChain runnable (LLM or chain) to call
+            max_batch_size: Largest number of inputs sent in one batch
+            window: Seconds to wait for more inputs after the first one arrives
+            max_concurrency: Concurrent requests abatch may issue
+        """
+        self.runnable = runnable
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self.max_concurrency = max_concurrency
+
+        # Queue and worker belong to one event loop; both are recreated on a new loop.
+        # The worker exits once the queue is empty and is restarted by the next submit.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # In-flight batch tasks; the loop only holds weak references to tasks
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def submit(self, value: Any) -> Any:
+        """
+        Queue one input and wait for its result.
+
+        Args:
+            value: Input for the runnable
+
+        Returns:
+            The runnable's output for this input
+
+        Raises:
+            Exception: Whatever the runnable raised for this input
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+            self._inflight = set()
+
+        future = loop.create_future()
+        self._queue.put_nowait((value, future))
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        return await future
+
+    async def _run(self) -> None:
+        """
+        Drain the queue in windows and start each batch as its own task.
+        
+        The worker does not wait for a batch's call to finish, so requests that
+        arrive meanwhile form the next batch right away instead of queueing
+        behind it.
+        """
+        loop = asyncio.get_running_loop()
+        while not self._queue.empty():
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            task = loop.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Send one batch and hand each result or exception back to its caller."""
+        try:
+            results = await self.runnable.abatch(
+                [value for value, _ in batch],
+                config={"max_concurrency": self.max_concurrency},
+                return_exceptions=True
+            )
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -7,27 +7,70 @@ and database connection setup.
 
 
 import os
+import functools
+import threading
+import httpx
+from types import MappingProxyType
+from typing import Mapping
 from dotenv import load_dotenv
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.exc import SQLAlchemyError
 
+from .utils import clear_inspectors
+
+
+@functools.lru_cache(maxsize=None)
+def _load_env() -> None:
+    """Load the .env file once per process."""
+    load_dotenv()
+
+
 # Load environment variables
-load_dotenv()
+_load_env()
+
+# Environment values are read once at import time and shared by every config instance
+OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY02")
+DATABASE_URL = os.environ.get("DATABASE_URL")
+MODEL_NAME = "openai/gpt-oss-20b:free"
+# Cheaper model for turns that only need wording, not SQL
+SMALL_MODEL_NAME = os.environ.get("SMALL_MODEL_NAME", "openai/gpt-4o-mini")
+BASE_URL = "https://openrouter.ai/api/v1"
+
+# One engine per database URL, shared across agent instances
+_ENGINES = {}
+_ENGINE_LOCK = threading.Lock()
+
+# URL scheme prefixes mapped to database types, checked in order
+_DATABASE_TYPE_PREFIXES = {
+    'postgresql': 'postgresql',
+    'postgres:': 'postgresql',
+    'mysql': 'mysql',
+    'sqlite': 'sqlite'
+}
+
+# Set AGENT_DEBUG=1 to print the loaded configuration on startup
+DEBUG = os.environ.get("AGENT_DEBUG", "").lower() in ("1", "true", "yes")
 
 
 class DatabaseConfig:
     """Configuration class for database and AI model settings."""
     
     def __init__(self):
-        """Initialize configuration with environment variables."""
+        """Initialize configuration from the cached environment values."""
         # AI Model Configuration
-        self.openrouter_api_key = os.getenv("OPENROUTER_API_KEY02")
-        self.model_name = "openai/gpt-oss-20b:free"
-        self.base_url = "https://openrouter.ai/api/v1"
+        self.openrouter_api_key = OPENROUTER_API_KEY
+        self.model_name = MODEL_NAME
+        self.small_model_name = SMALL_MODEL_NAME
+        self.base_url = BASE_URL
         
         # Database Configuration
-        self.database_url = os.getenv("DATABASE_URL")
+        self.database_url = DATABASE_URL
+        self._database_url_lower = DATABASE_URL.lower() if DATABASE_URL else ""
+        self._database_type = None
         
         # Validate required environment variables
         self._validate_config()
@@ -40,24 +83,32 @@ class DatabaseConfig:
         if not self.openrouter_api_key:
             raise ValueError("OPENROUTER_API_KEY06 not found in environment variables. Please check your .env file.")
         
-        # Debug: Print configuration (without exposing the full API key)
-        print(f"🔧 Configuration loaded:")
-        print(f"   - Database URL: {self.database_url[:50]}..." if self.database_url else "   - Database URL: Not set")
-        print(f"   - API Key: {self.openrouter_api_key[:20]}..." if self.openrouter_api_key else "   - API Key: Not set")
-        print(f"   - Model: {self.model_name}")
-        print(f"   - Base URL: {self.base_url}")
+        if DEBUG:
+            # Debug: Print configuration (without exposing the full API key)
+            print(f"🔧 Configuration loaded:")
+            print(f"   - Database URL: {self.database_url[:50]}...")
+            print(f"   - API Key: {self.openrouter_api_key[:20]}...")
+            print(f"   - Model: {self.model_name}")
+            print(f"   - Small model: {self.small_model_name}")
+            print(f"   - Base URL: {self.base_url}")
     
-    def get_llm_config(self):
-        """Get LLM configuration dictionary."""
-        return {
+    @functools.cached_property
+    def llm_config(self) -> Mapping[str, str]:
+        """Read-only LLM configuration, built once per config instance."""
+        return MappingProxyType({
             "model": self.model_name,
+            "small_model": self.small_model_name,
             "api_key": self.openrouter_api_key,
             "base_url": self.base_url
-        }
+        })
+    
+    def get_llm_config(self):
+        """Get LLM configuration mapping."""
+        return self.llm_config
     
     def create_database_engine(self):
         """
-        Create and test database engine connection.
+        Get the shared database engine, creating and testing it on first use.
         
         Returns:
             SQLAlchemy engine instance
@@ -65,14 +116,48 @@ class DatabaseConfig:
         Raises:
             ConnectionError: If database connection fails
         """
-        try:
-            engine = create_engine(self.database_url, echo=False)
-            # Test connection
-            with engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
+        engine = _ENGINES.get(self.database_url)
+        if engine is not None:
             return engine
-        except Exception as e:
-            raise ConnectionError(f"Failed to connect to database: {str(e)}. Please check your DATABASE_URL in .env file.")
+        
+        with _ENGINE_LOCK:
+            engine = _ENGINES.get(self.database_url)
+            if engine is not None:
+                return engine
+            try:
+                engine = create_engine(self.database_url, echo=False, **self.get_pool_settings())
+                # Test connection once per new engine; cached engines skip the probe
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            except Exception as e:
+                raise ConnectionError(f"Failed to connect to database: {str(e)}. Please check your DATABASE_URL in .env file.")
+            _ENGINES[self.database_url] = engine
+            return engine
+    
+    def get_pool_settings(self):
+        """
+        Get connection pool keyword arguments for create_engine.
+        
+        SQLite shares a single connection through StaticPool; server
+        databases get a sized LIFO QueuePool with pre-ping enabled.
+        
+        Returns:
+            Dictionary of create_engine keyword arguments
+        """
+        if self.database_url.lower().startswith('sqlite'):
+            return {
+                "poolclass": StaticPool,
+                "connect_args": {"check_same_thread": False}
+            }
+        
+        return {
+            "pool_size": AgentConfig.POOL_SIZE,
+            "max_overflow": AgentConfig.POOL_OVERFLOW,
+            "pool_timeout": AgentConfig.POOL_TIMEOUT,
+            "pool_recycle": AgentConfig.POOL_RECYCLE,
+            "pool_pre_ping": AgentConfig.POOL_PRE_PING,
+            "pool_use_lifo": AgentConfig.POOL_USE_LIFO
+        }
     
     def create_session_factory(self, engine):
         """
@@ -90,32 +175,94 @@ class DatabaseConfig:
         """
         Detect the database type from the connection URL.
         
+        The result is memoized since the URL does not change within a process.
+        
         Args:
             engine: SQLAlchemy engine instance
             
         Returns:
             Database type ('postgresql', 'mysql', 'sqlite', etc.)
         """
-        try:
-            if 'postgresql' in self.database_url.lower() or 'postgres' in self.database_url.lower():
-                return 'postgresql'
-            elif 'mysql' in self.database_url.lower():
-                return 'mysql'
-            elif 'sqlite' in self.database_url.lower():
-                return 'sqlite'
-            else:
-                # Try to detect from the driver
-                with engine.connect() as conn:
-                    result = conn.execute(text("SELECT version()"))
-                    version = result.fetchone()[0].lower()
-                    if 'postgresql' in version:
-                        return 'postgresql'
-                    elif 'mysql' in version:
-                        return 'mysql'
-                    else:
-                        return 'unknown'
-        except Exception:
-            return 'unknown'
+        if self._database_type is None:
+            self._database_type = self._detect_database_type(engine)
+        return self._database_type
+    
+    def _detect_database_type(self, engine):
+        """Resolve the database type from the URL prefix, falling back to the engine dialect."""
+        for prefix, db_type in _DATABASE_TYPE_PREFIXES.items():
+            if self._database_url_lower.startswith(prefix):
+                return db_type
+        
+        # SQLAlchemy already knows the dialect; no round-trip needed
+        return engine.dialect.name
+
+
+def dispose_engine() -> None:
+    """Dispose every shared engine and close its pooled connections."""
+    with _ENGINE_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+    # Cached Inspectors would otherwise keep the disposed engines alive
+    clear_inspectors()
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> DatabaseConfig:
+    """
+    Get the process-wide DatabaseConfig instance.
+    
+    Returns:
+        Cached DatabaseConfig, created and validated on first call
+    """
+    return DatabaseConfig()
+
+
+@functools.lru_cache(maxsize=1)
+def install_llm_cache() -> None:
+    """
+    Install the process-wide LangChain LLM cache once.
+    
+    Identical (model, messages) pairs are then answered from memory instead of
+    the API; later calls keep the existing cache and its entries.
+    """
+    set_llm_cache(InMemoryCache(maxsize=AgentConfig.LLM_CACHE_SIZE))
+
+
+def _http_client_settings():
+    """Connection limits and timeout shared by the LLM HTTP clients."""
+    return {
+        "limits": httpx.Limits(
+            max_connections=AgentConfig.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=AgentConfig.LLM_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        "timeout": httpx.Timeout(AgentConfig.LLM_TIMEOUT)
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """
+    Get the process-wide pooled HTTP client used for blocking LLM API calls.
+    
+    Returns:
+        httpx.Client with keep-alive pooling
+    """
+    return httpx.Client(**_http_client_settings())
+
+
+def create_async_http_client() -> httpx.AsyncClient:
+    """
+    Create a pooled async HTTP client for LLM API calls.
+    
+    Pooled connections stay bound to the event loop that opened them, so the
+    client must not be shared across loops; each agent owns one and closes it
+    on shutdown.
+    
+    Returns:
+        httpx.AsyncClient with keep-alive pooling
+    """
+    return httpx.AsyncClient(**_http_client_settings())
 
 
 class AgentConfig:
@@ -124,32 +271,68 @@ class AgentConfig:
     # Response settings
     MAX_RESPONSE_LENGTH = 50  # words
     MAX_TABLE_ROWS_DISPLAY = 10
+    MAX_RESULT_ROWS = 1000  # rows kept from a SELECT; the rest are never fetched
+    RESULT_FETCH_SIZE = 1000  # rows per server-side cursor round trip
     
     # Safety settings
-    DANGEROUS_OPERATIONS = ['DROP', 'DELETE', 'ALTER', 'TRUNCATE']
+    DANGEROUS_OPERATIONS = ('DROP', 'DELETE', 'ALTER', 'TRUNCATE')
     REQUIRE_HUMAN_APPROVAL = True
     
     # Database operation settings
     AUTO_COMMIT = True
     ECHO_SQL = False
+    VERIFY_DDL = False  # re-check CREATE/DROP TABLE with a catalog query before commit
+    
+    # Connection pool settings (ignored for SQLite)
+    POOL_SIZE = 20
+    POOL_OVERFLOW = 30
+    POOL_TIMEOUT = 30  # seconds
+    POOL_RECYCLE = 1800  # seconds
+    POOL_PRE_PING = True
+    POOL_USE_LIFO = True
+    
+    # LLM response caching
+    LLM_CACHE_SIZE = 1024  # cached prompt/response pairs
+    PLAN_CACHE_SIZE = 256  # cached router plans per agent
+    SCHEMA_CACHE_TTL = 300  # seconds a table schema is reused
+    DATABASE_INFO_TTL = 30  # seconds the get_database_info overview is reused
+    
+    # Batching of concurrent LLM calls across conversations
+    LLM_BATCH_SIZE = 16
+    LLM_BATCH_WINDOW = 0.02  # seconds to collect a batch
+    LLM_MAX_CONCURRENCY = 16
+    
+    # LLM HTTP settings; the OpenAI client retries 429/5xx with jittered backoff
+    LLM_MAX_RETRIES = 4
+    LLM_TIMEOUT = 30  # seconds
+    LLM_MAX_CONNECTIONS = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS = 50
     
     # Thread management
     DEFAULT_THREAD_TIMEOUT = 3600  # 1 hour in seconds
+    HISTORY_MAX_MESSAGES = 20  # summarize older messages once a thread is longer than this
+    HISTORY_KEEP_MESSAGES = 10  # most recent messages kept verbatim
     
     @classmethod
     def get_safety_settings(cls):
         """Get safety configuration settings."""
-        return {
-            "dangerous_operations": cls.DANGEROUS_OPERATIONS,
-            "require_human_approval": cls.REQUIRE_HUMAN_APPROVAL,
-            "auto_commit": cls.AUTO_COMMIT
-        }
+        return SAFETY_SETTINGS
     
     @classmethod
     def get_display_settings(cls):
         """Get display configuration settings."""
-        return {
-            "max_response_length": cls.MAX_RESPONSE_LENGTH,
-            "max_table_rows": cls.MAX_TABLE_ROWS_DISPLAY,
-            "echo_sql": cls.ECHO_SQL
-        }
+        return DISPLAY_SETTINGS
+
+
+# Settings snapshots computed once at import; read-only so they can be shared
+SAFETY_SETTINGS = MappingProxyType({
+    "dangerous_operations": AgentConfig.DANGEROUS_OPERATIONS,
+    "require_human_approval": AgentConfig.REQUIRE_HUMAN_APPROVAL,
+    "auto_commit": AgentConfig.AUTO_COMMIT
+})
+
+DISPLAY_SETTINGS = MappingProxyType({
+    "max_response_length": AgentConfig.MAX_RESPONSE_LENGTH,
+    "max_table_rows": AgentConfig.MAX_TABLE_ROWS_DISPLAY,
+    "echo_sql": AgentConfig.ECHO_SQL
+})
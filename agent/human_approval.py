@@ -6,10 +6,49 @@ in a web-based environment, replacing console-based input with
 proper API endpoints and state management.
 """
 
+import re
+import time
+import heapq
+import threading
 import uuid
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timezone
 from enum import Enum
+from dataclasses import dataclass
+
+
+# Opcodes of statements that require human approval
+_DANGEROUS_OPCODES = frozenset({'DROP', 'DELETE', 'ALTER', 'TRUNCATE'})
+
+# No SQL opcode we classify is longer than this
+_MAX_OPCODE_LENGTH = 16
+
+
+def _leading_opcode(sql_query: str) -> str:
+    """
+    Get the uppercased first word of a SQL query.
+    
+    Only the leading keyword is scanned and copied, so the cost does not
+    grow with the length of the query.
+    
+    Args:
+        sql_query: SQL query to inspect
+        
+    Returns:
+        Leading opcode, or an empty string if the query has none
+    """
+    s = sql_query.lstrip()
+    end = 0
+    while end < len(s) and end < _MAX_OPCODE_LENGTH and s[end].isalpha():
+        end += 1
+    return s[:end].upper()
+
+
+# Captures the target table of DROP TABLE, DELETE FROM and ALTER TABLE in a single pass
+_TABLE_RE = re.compile(
+    r'(?:DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?|DELETE\s+FROM\s+|ALTER\s+TABLE\s+)(\w+)',
+    re.IGNORECASE
+)
 
 
 class ApprovalStatus(Enum):
@@ -20,18 +59,83 @@ class ApprovalStatus(Enum):
     EXPIRED = "expired"
 
 
+# Plain status strings for hot-path comparisons
+_PENDING = ApprovalStatus.PENDING.value
+_APPROVED = ApprovalStatus.APPROVED.value
+_DENIED = ApprovalStatus.DENIED.value
+_EXPIRED = ApprovalStatus.EXPIRED.value
+
+
+@dataclass(slots=True)
+class ApprovalRequest:
+    """A single approval request; timestamps are seconds since the epoch."""
+    id: str
+    sql_query: str
+    operation_type: str
+    table_name: Optional[str]
+    description: str
+    status: str
+    created_at: float
+    expires_at: float
+    approved_at: Optional[float] = None
+    denied_at: Optional[float] = None
+    approved_by: Optional[str] = None
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the request for API responses.
+        
+        Returns:
+            Dictionary with timestamps formatted as ISO strings
+        """
+        return {
+            "id": self.id,
+            "sql_query": self.sql_query,
+            "operation_type": self.operation_type,
+            "table_name": self.table_name,
+            "description": self.description,
+            "status": self.status,
+            "created_at": _isoformat(self.created_at),
+            "expires_at": _isoformat(self.expires_at),
+            "approved_at": _isoformat(self.approved_at),
+            "denied_at": _isoformat(self.denied_at),
+            "approved_by": self.approved_by
+        }
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    """Format an epoch timestamp as a UTC ISO string, passing None through."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat() if timestamp is not None else None
+
+
 class HumanApprovalManager:
     """
     Manages human approval for dangerous database operations.
     
     This class handles approval requests, tracks their status,
     and provides a web-compatible interface for human approval.
+    
+    Pending requests live for ``approval_timeout`` seconds and are evicted
+    on access, TTL-cache style. Approved and denied requests move to a
+    bounded terminal store so their outcome can still be looked up.
     """
     
+    # Maximum number of approved/denied requests kept for status lookups
+    MAX_TERMINAL_APPROVALS = 10_000
+    
     def __init__(self):
         """Initialize the approval manager with empty storage."""
-        self.pending_approvals: Dict[str, Dict[str, Any]] = {}
+        self.pending_approvals: Dict[str, ApprovalRequest] = {}
         self.approval_timeout = 300  # 5 minutes timeout
+        
+        # Approved/denied requests, oldest first
+        self._terminal_approvals: Dict[str, ApprovalRequest] = {}
+        
+        # Min-heap of (expires_at, approval_id) so eviction only touches expired entries
+        self._expiry_heap: List[Tuple[float, str]] = []
+        
+        # Guards the approval stores and the expiry heap across request threads
+        self._lock = threading.RLock()
     
     def create_approval_request(self, sql_query: str, operation_type: str, 
                                table_name: Optional[str] = None, 
@@ -48,30 +152,30 @@ class HumanApprovalManager:
         Returns:
             Dictionary containing approval request details
         """
-        approval_id = str(uuid.uuid4())
-        timestamp = datetime.now()
-        
-        approval_request = {
-            "id": approval_id,
-            "sql_query": sql_query,
-            "operation_type": operation_type,
-            "table_name": table_name,
-            "description": description or f"{operation_type} operation on database",
-            "status": ApprovalStatus.PENDING.value,
-            "created_at": timestamp.isoformat(),
-            "expires_at": datetime.fromtimestamp(timestamp.timestamp() + self.approval_timeout).isoformat(),
-            "approved_at": None,
-            "denied_at": None,
-            "approved_by": None
-        }
-        
-        self.pending_approvals[approval_id] = approval_request
-        
-        return {
-            "approval_id": approval_id,
-            "requires_approval": True,
-            "approval_request": approval_request
-        }
+        with self._lock:
+            approval_id = str(uuid.uuid4())
+            timestamp = time.time()
+            self._evict_expired(timestamp)
+            
+            approval_request = ApprovalRequest(
+                id=approval_id,
+                sql_query=sql_query,
+                operation_type=operation_type,
+                table_name=table_name,
+                description=description or f"{operation_type} operation on database",
+                status=_PENDING,
+                created_at=timestamp,
+                expires_at=timestamp + self.approval_timeout
+            )
+            
+            self.pending_approvals[approval_id] = approval_request
+            heapq.heappush(self._expiry_heap, (approval_request.expires_at, approval_id))
+            
+            return {
+                "approval_id": approval_id,
+                "requires_approval": True,
+                "approval_request": approval_request.as_dict()
+            }
     
     def get_approval_status(self, approval_id: str) -> Dict[str, Any]:
         """
@@ -83,30 +187,22 @@ class HumanApprovalManager:
         Returns:
             Dictionary containing approval status and details
         """
-        if approval_id not in self.pending_approvals:
-            return {
-                "error": "Approval request not found",
-                "requires_approval": False
-            }
-        
-        approval = self.pending_approvals[approval_id]
-        
-        # Check if approval has expired
-        if self._is_expired(approval):
-            approval["status"] = ApprovalStatus.EXPIRED.value
+        with self._lock:
+            self._evict_expired(time.time())
+            
+            approval = self.pending_approvals.get(approval_id) or self._terminal_approvals.get(approval_id)
+            if approval is None:
+                return {
+                    "error": "Approval request not found",
+                    "requires_approval": False
+                }
+            
             return {
                 "approval_id": approval_id,
-                "status": ApprovalStatus.EXPIRED.value,
-                "requires_approval": False,
-                "message": "Approval request has expired"
+                "status": approval.status,
+                "requires_approval": approval.status == _PENDING,
+                "approval_request": approval.as_dict()
             }
-        
-        return {
-            "approval_id": approval_id,
-            "status": approval["status"],
-            "requires_approval": approval["status"] == ApprovalStatus.PENDING.value,
-            "approval_request": approval
-        }
     
     def approve_operation(self, approval_id: str, approved_by: str = "user") -> Dict[str, Any]:
         """
@@ -119,39 +215,24 @@ class HumanApprovalManager:
         Returns:
             Dictionary containing approval result
         """
-        if approval_id not in self.pending_approvals:
-            return {
-                "success": False,
-                "error": "Approval request not found"
-            }
-        
-        approval = self.pending_approvals[approval_id]
-        
-        if approval["status"] != ApprovalStatus.PENDING.value:
-            return {
-                "success": False,
-                "error": f"Approval request is not pending (current status: {approval['status']})"
-            }
-        
-        if self._is_expired(approval):
-            approval["status"] = ApprovalStatus.EXPIRED.value
+        with self._lock:
+            approval = self._take_pending(approval_id)
+            if isinstance(approval, dict):
+                return approval
+            
+            # Update approval status
+            approval.status = _APPROVED
+            approval.approved_at = time.time()
+            approval.approved_by = approved_by
+            self._store_terminal(approval)
+            
             return {
-                "success": False,
-                "error": "Approval request has expired"
+                "success": True,
+                "approval_id": approval_id,
+                "status": _APPROVED,
+                "sql_query": approval.sql_query,
+                "message": "Operation approved successfully"
             }
-        
-        # Update approval status
-        approval["status"] = ApprovalStatus.APPROVED.value
-        approval["approved_at"] = datetime.now().isoformat()
-        approval["approved_by"] = approved_by
-        
-        return {
-            "success": True,
-            "approval_id": approval_id,
-            "status": ApprovalStatus.APPROVED.value,
-            "sql_query": approval["sql_query"],
-            "message": "Operation approved successfully"
-        }
     
     def deny_operation(self, approval_id: str, denied_by: str = "user") -> Dict[str, Any]:
         """
@@ -164,31 +245,23 @@ class HumanApprovalManager:
         Returns:
             Dictionary containing denial result
         """
-        if approval_id not in self.pending_approvals:
-            return {
-                "success": False,
-                "error": "Approval request not found"
-            }
-        
-        approval = self.pending_approvals[approval_id]
-        
-        if approval["status"] != ApprovalStatus.PENDING.value:
+        with self._lock:
+            approval = self._take_pending(approval_id)
+            if isinstance(approval, dict):
+                return approval
+            
+            # Update approval status
+            approval.status = _DENIED
+            approval.denied_at = time.time()
+            approval.approved_by = denied_by
+            self._store_terminal(approval)
+            
             return {
-                "success": False,
-                "error": f"Approval request is not pending (current status: {approval['status']})"
+                "success": True,
+                "approval_id": approval_id,
+                "status": _DENIED,
+                "message": "Operation denied successfully"
             }
-        
-        # Update approval status
-        approval["status"] = ApprovalStatus.DENIED.value
-        approval["denied_at"] = datetime.now().isoformat()
-        approval["approved_by"] = denied_by
-        
-        return {
-            "success": True,
-            "approval_id": approval_id,
-            "status": ApprovalStatus.DENIED.value,
-            "message": "Operation denied successfully"
-        }
     
     def get_pending_approvals(self) -> Dict[str, Any]:
         """
@@ -197,58 +270,99 @@ class HumanApprovalManager:
         Returns:
             Dictionary containing list of pending approvals
         """
-        pending = []
-        expired_ids = []
-        
-        for approval_id, approval in self.pending_approvals.items():
-            if self._is_expired(approval):
-                approval["status"] = ApprovalStatus.EXPIRED.value
-                expired_ids.append(approval_id)
-            elif approval["status"] == ApprovalStatus.PENDING.value:
-                pending.append(approval)
-        
-        # Clean up expired approvals
-        for approval_id in expired_ids:
-            del self.pending_approvals[approval_id]
-        
-        return {
-            "pending_approvals": pending,
-            "count": len(pending)
-        }
+        with self._lock:
+            self._evict_expired(time.time())
+            
+            pending = [approval.as_dict() for approval in self.pending_approvals.values()]
+            
+            return {
+                "pending_approvals": pending,
+                "count": len(pending)
+            }
     
     def cleanup_expired_approvals(self) -> int:
         """
-        Clean up expired approval requests.
+        Evict expired approval requests immediately.
+        
+        Expired requests are also evicted on every other call, so this is
+        only needed to release memory during idle periods.
         
         Returns:
             Number of expired approvals cleaned up
         """
-        expired_ids = []
+        with self._lock:
+            return len(self._evict_expired(time.time()))
+    
+    def _take_pending(self, approval_id: str):
+        """
+        Remove a request from the pending store so it can be decided.
         
-        for approval_id, approval in self.pending_approvals.items():
-            if self._is_expired(approval):
-                expired_ids.append(approval_id)
+        Args:
+            approval_id: ID of the approval request
+            
+        Returns:
+            The pending ApprovalRequest, or an error result dictionary
+        """
+        self._evict_expired(time.time())
         
-        for approval_id in expired_ids:
-            del self.pending_approvals[approval_id]
+        approval = self.pending_approvals.pop(approval_id, None)
+        if approval is not None:
+            return approval
         
-        return len(expired_ids)
+        terminal = self._terminal_approvals.get(approval_id)
+        if terminal is not None:
+            return {
+                "success": False,
+                "error": f"Approval request is not pending (current status: {terminal.status})"
+            }
+        
+        return {
+            "success": False,
+            "error": "Approval request not found"
+        }
     
-    def _is_expired(self, approval: Dict[str, Any]) -> bool:
+    def _store_terminal(self, approval: ApprovalRequest) -> None:
+        """Keep a decided request, dropping the oldest once the store is full."""
+        self._terminal_approvals[approval.id] = approval
+        if len(self._terminal_approvals) > self.MAX_TERMINAL_APPROVALS:
+            del self._terminal_approvals[next(iter(self._terminal_approvals))]
+    
+    def _evict_expired(self, now: float) -> List[str]:
         """
-        Check if an approval request has expired.
+        Remove every pending approval whose expiry time has passed.
+        
+        Pops the expiry heap until its head is in the future, so the cost
+        is proportional to the number of expired entries, not the store size.
+        Heap entries for requests that were already decided are skipped.
+        When a large share of the store expires at once, the dict is rebuilt
+        in one pass instead of deleting entries one by one.
         
         Args:
-            approval: Approval request dictionary
+            now: Current epoch time
             
         Returns:
-            True if expired, False otherwise
+            IDs of the evicted approvals
         """
-        try:
-            expires_at = datetime.fromisoformat(approval["expires_at"])
-            return datetime.now() > expires_at
-        except (ValueError, KeyError):
-            return True
+        expired_ids = []
+        
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            _, approval_id = heapq.heappop(self._expiry_heap)
+            approval = self.pending_approvals.get(approval_id)
+            if approval is not None:
+                approval.status = _EXPIRED
+                expired_ids.append(approval_id)
+        
+        if len(expired_ids) > len(self.pending_approvals) // 4:
+            self.pending_approvals = {
+                approval_id: approval
+                for approval_id, approval in self.pending_approvals.items()
+                if approval.status != _EXPIRED
+            }
+        else:
+            for approval_id in expired_ids:
+                del self.pending_approvals[approval_id]
+        
+        return expired_ids
     
     def is_dangerous_operation(self, sql_query: str) -> bool:
         """
@@ -260,14 +374,7 @@ class HumanApprovalManager:
         Returns:
             True if the operation is dangerous and requires approval
         """
-        dangerous_operations = ['DROP', 'DELETE', 'ALTER', 'TRUNCATE']
-        query_upper = sql_query.upper().strip()
-        
-        for op in dangerous_operations:
-            if query_upper.startswith(op):
-                return True
-        
-        return False
+        return _leading_opcode(sql_query) in _DANGEROUS_OPCODES
     
     def get_operation_type(self, sql_query: str) -> str:
         """
@@ -279,18 +386,8 @@ class HumanApprovalManager:
         Returns:
             Operation type (DROP, DELETE, ALTER, etc.)
         """
-        query_upper = sql_query.upper().strip()
-        
-        if query_upper.startswith('DROP'):
-            return 'DROP'
-        elif query_upper.startswith('DELETE'):
-            return 'DELETE'
-        elif query_upper.startswith('ALTER'):
-            return 'ALTER'
-        elif query_upper.startswith('TRUNCATE'):
-            return 'TRUNCATE'
-        else:
-            return 'UNKNOWN'
+        opcode = _leading_opcode(sql_query)
+        return opcode if opcode in _DANGEROUS_OPCODES else 'UNKNOWN'
     
     def extract_table_name(self, sql_query: str) -> Optional[str]:
         """
@@ -302,27 +399,8 @@ class HumanApprovalManager:
         Returns:
             Table name if found, None otherwise
         """
-        import re
-        
-        # Pattern for DROP TABLE
-        drop_pattern = r'DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?(\w+)'
-        match = re.search(drop_pattern, sql_query, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        
-        # Pattern for DELETE FROM
-        delete_pattern = r'DELETE\s+FROM\s+(\w+)'
-        match = re.search(delete_pattern, sql_query, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        
-        # Pattern for ALTER TABLE
-        alter_pattern = r'ALTER\s+TABLE\s+(\w+)'
-        match = re.search(alter_pattern, sql_query, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        
-        return None
+        match = _TABLE_RE.search(sql_query)
+        return match.group(1) if match else None
 
 
 # Global instance for the application
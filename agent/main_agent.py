@@ -13,30 +13,43 @@ About the Project:
 """
 
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, RemoveMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
 from langgraph.checkpoint.memory import MemorySaver
-from typing import Dict, List, Any, Optional, TypedDict, Annotated
-from sqlalchemy import text, inspect
+from typing import Dict, List, Any, Optional, Tuple, TypedDict, Annotated, Literal
+from pydantic import BaseModel, Field
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
+from collections import OrderedDict
+from dataclasses import dataclass
+import asyncio
 import json
+import logging
+import re
+import time
 from datetime import datetime
+from functools import lru_cache
 import uuid
 
+logger = logging.getLogger(__name__)
+
 try:
-    from .config import DatabaseConfig, AgentConfig
-    from .utils import get_full_database_schema, get_table_schema
+    from .config import AgentConfig, get_config, get_http_client, create_async_http_client, install_llm_cache
+    from .utils import get_full_database_schema, get_table_schema, invalidate_schema_cache, get_inspector
 
     from .system_prompts import (
-        SYSTEM_PROMPT, HELP_TEXT, get_router_prompt, get_operation_prompt,
-        get_sql_generation_prompt, get_response_prompt, get_database_rules
+        SYSTEM_PROMPT, HELP_TEXT, get_operation_prompt,
+        get_sql_generation_prompt, get_response_prompt, get_database_rules,
+        get_plan_prompt, get_result_message, get_summary_prompt, SQL_SYSTEM_PROMPT, CREATE_TABLE_SYSTEM_PROMPT
         )
     from .tools import DatabaseTools
-    from .simple_approval import simple_approval_manager
+    from .batching import LLMBatcher
+    from .simple_approval import simple_approval_manager, is_dangerous_sql
 
 except Exception as e:
-    print(f"Error importing modules is main_agent file: {e}")
+    logger.error("Error importing modules is main_agent file: %s", e)
    
 
 
@@ -49,6 +62,196 @@ class ConversationState(TypedDict):
     human_approval: Optional[bool]
     approval_pending: Optional[bool]
     approval_id: Optional[str]
+    intent: Optional[Literal["create_table", "sql_op", "chat"]]
+    tables: Optional[List[str]]
+
+
+class OperationPlan(BaseModel):
+    """Routing decision plus the tables and SQL for the user's request, from one LLM call."""
+    action: Literal["database_operation", "response", "end"]
+    tables: List[str] = Field(default_factory=list)
+    sql: Optional[str] = None
+
+
+class TableExtraction(BaseModel):
+    """Table names the LLM found in a user's request."""
+    tables: List[str] = Field(default_factory=list)
+
+
+class DDLVerificationError(Exception):
+    """A CREATE/DROP TABLE ran but the catalog does not show its effect; rolls back the transaction."""
+
+
+# Messages starting with one of these are SQL already; no routing call needed
+SQL_VERBS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'CREATE', 'ALTER', 'DROP', 'WITH')
+
+# Words that settle routing without an LLM call: any database word sends the turn
+# to the database node; a short message made only of small talk gets a reply
+DB_KEYWORDS = frozenset({
+    "select", "insert", "update", "delete", "alter", "drop", "create", "table", "tables",
+    "column", "columns", "schema", "row", "rows", "record", "records", "database"
+})
+CHATTY_WORDS = frozenset({"hi", "hello", "hey", "thanks", "thank", "you", "bye", "ok", "okay"})
+WORD_RE = re.compile(r"[a-z_]+")
+
+# A fenced SQL block is complete once its closing backticks arrive
+SQL_BLOCK_RE = re.compile(r"```(?:sql)?[ \t]*\n.*?```", re.DOTALL | re.IGNORECASE)
+
+# SQL statement patterns for pulling a query out of LLM output, in priority order
+SQL_FENCED_RE = re.compile(r'```sql\s*(.*?)\s*```', re.DOTALL | re.IGNORECASE)
+SQL_FENCED_KEYWORD_RE = re.compile(
+    r'```\s*((?:SELECT|INSERT|UPDATE|DELETE|CREATE|DROP|ALTER|WITH)\b.*?)```', re.DOTALL | re.IGNORECASE
+)
+CREATE_STATEMENT_RE = re.compile(r'(CREATE\s+TABLE\s+.*?)(?=\n\n|\n$|$|;)', re.DOTALL | re.IGNORECASE)
+OTHER_STATEMENT_RE = re.compile(
+    r'((?:SELECT|INSERT|UPDATE|DELETE|DROP|ALTER|WITH)\b.*?)(?=\n\n|\n$|$|;)', re.DOTALL | re.IGNORECASE
+)
+
+# Phrases marking a request to create a new table
+CREATE_REQUEST_KEYWORDS = (
+    'create table', 'make table', 'add table', 'new table',
+    'create a table', 'table name', 'database name'
+)
+
+# Name of the table to create, from a lower-cased CREATE request
+CREATE_TABLE_NAME_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'table\s+name\s+(\w+)',
+    r'database\s+name\s+(\w+)',
+    r'create\s+table\s+(\w+)',
+    r'new\s+table\s+called?\s+(\w+)',
+    r'make\s+table\s+(\w+)',
+    r'add\s+table\s+(\w+)'
+))
+
+# Requests that need column types in the schema, not just column names
+WRITE_INTENT_RE = re.compile(r'\b(?:insert|update|alter)\b', re.IGNORECASE)
+
+# Parsed TextClause per SQL string; repeated statements skip bind-parameter parsing
+# and present the identical statement SQLAlchemy's compiled cache keys on
+sql_text = lru_cache(maxsize=256)(text)
+
+
+@lru_cache(maxsize=256)
+def _insert_statement(table_name: str, columns: Tuple[str, ...]):
+    """Build the parameterized INSERT for a table and column set once."""
+    placeholders = ', '.join(':' + col for col in columns)
+    return text(f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})")
+
+
+@lru_cache(maxsize=256)
+def _update_statement(table_name: str, columns: Tuple[str, ...], where_clause: str):
+    """Build the parameterized UPDATE for a table, column set and WHERE clause once."""
+    set_clauses = ', '.join(f"{col} = :{col}" for col in columns)
+    return text(f"UPDATE {table_name} SET {set_clauses} WHERE {where_clause}")
+
+# Fixed system messages, built once and shared by every request
+PLAN_SYSTEM_MESSAGE = SystemMessage(content="You are a database planning assistant. Fill in every field of the plan.")
+TABLE_EXTRACTION_SYSTEM_MESSAGE = SystemMessage(content="You are a table name extraction assistant. Fill in the list of tables.")
+SQL_SYSTEM_MESSAGE = SystemMessage(content=SQL_SYSTEM_PROMPT)
+CREATE_TABLE_SYSTEM_MESSAGE = SystemMessage(content=CREATE_TABLE_SYSTEM_PROMPT)
+
+# Fixed pieces of the response prompt context
+DB_OP_PREFIX = "Database Operation Result: "
+DB_INFO_PREFIX = "Database Summary:\n"
+APPROVAL_CONTEXT = {
+    True: "Human approved the database operation.",
+    False: "Human denied the database operation.",
+}
+NO_CONTEXT = "No additional context available."
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+# No SQL keyword we dispatch on is longer than this
+MAX_VERB_LENGTH = 16
+
+# Table touched by a schema-changing statement (for schema cache invalidation)
+DDL_TABLE_RE = re.compile(
+    r"^\s*(?:CREATE|ALTER|DROP)\s+TABLE\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?[`\"\[]?(\w+)",
+    re.IGNORECASE
+)
+DDL_VERBS = frozenset({'CREATE', 'ALTER', 'DROP'})
+
+# Target table per verb; for INSERT also the optional column list
+IDENTIFIER_STRIP = '`"[]()'
+INSERT_COLS_RE = re.compile(r'\s*INSERT\s+INTO\s+[`"\[]?(\w+)[`"\]]?\s*(?:\(([^)]+)\))?', re.IGNORECASE)
+TABLE_RE_BY_VERB = {
+    'INSERT': INSERT_COLS_RE,
+    'UPDATE': re.compile(r'\s*UPDATE\s+[`"\[]?(\w+)', re.IGNORECASE),
+    'DELETE': re.compile(r'\s*DELETE\s+FROM\s+[`"\[]?(\w+)', re.IGNORECASE),
+    **dict.fromkeys(DDL_VERBS, DDL_TABLE_RE),
+}
+
+
+def _first_verb(sql: str) -> str:
+    """
+    Get the uppercased leading keyword of a SQL statement.
+    
+    Only the keyword itself is scanned and copied, so the cost does not grow
+    with the length of the statement.
+    
+    Args:
+        sql: SQL statement
+        
+    Returns:
+        Leading keyword, or an empty string if the statement has none
+    """
+    length = len(sql)
+    start = 0
+    while start < length and sql[start].isspace():
+        start += 1
+    end = start
+    while end < length and end - start < MAX_VERB_LENGTH and sql[end].isalpha():
+        end += 1
+    return sql[start:end].upper()
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedSQL:
+    """Leading keyword, target table and INSERT column list of a SQL statement."""
+    verb: str
+    table: Optional[str] = None
+    columns: Optional[Tuple[str, ...]] = None
+
+
+@lru_cache(maxsize=256)
+def _parse_sql(sql: str) -> ParsedSQL:
+    """
+    Parse a SQL statement once for validation, execution and cache invalidation.
+    
+    Results are cached per statement, so a query validated before execution or
+    re-run after approval is not parsed again.
+    
+    Args:
+        sql: SQL statement
+        
+    Returns:
+        ParsedSQL; table and columns are None when they cannot be determined
+    """
+    verb = _first_verb(sql)
+    table_re = TABLE_RE_BY_VERB.get(verb)
+    match = table_re.match(sql) if table_re else None
+    if not match:
+        return ParsedSQL(verb)
+    
+    columns = None
+    if table_re is INSERT_COLS_RE and match.group(2):
+        columns = tuple(col.strip().strip(IDENTIFIER_STRIP) for col in match.group(2).split(','))
+    return ParsedSQL(verb, match.group(1), columns)
+
+
+def _bind_agent(method):
+    """
+    Wrap an unbound DatabaseAgent method as a graph node or edge function.
+    
+    The agent is read from the run config, so one compiled graph serves every agent.
+    """
+    if asyncio.iscoroutinefunction(method):
+        async def call(state: ConversationState, config: RunnableConfig):
+            return await method(config["configurable"]["agent"], state)
+    else:
+        def call(state: ConversationState, config: RunnableConfig):
+            return method(config["configurable"]["agent"], state)
+    call.__name__ = method.__name__
+    return call
 
 
 class DatabaseAgent:
@@ -67,49 +270,126 @@ class DatabaseAgent:
         and LLM-driven workflow for intelligent decision making.
         """
         # Initialize configuration
-        self.config = DatabaseConfig()
+        self.config = get_config()
         self.agent_config = AgentConfig()
         
+        # Identical (model, messages) pairs are answered from memory, not OpenRouter
+        install_llm_cache()
+        
         # Initialize LLM with configuration
         llm_config = self.config.get_llm_config()
-        self.llm = ChatOpenAI(
-            model=llm_config["model"],
-            api_key=llm_config["api_key"],
-            base_url=llm_config["base_url"]
+        # The async client is per agent: its pooled connections belong to one event loop
+        self._http_async_client = create_async_http_client()
+        client_settings = {
+            "api_key": llm_config["api_key"],
+            "base_url": llm_config["base_url"],
+            "max_retries": AgentConfig.LLM_MAX_RETRIES,
+            "timeout": AgentConfig.LLM_TIMEOUT,
+            "http_client": get_http_client(),
+            "http_async_client": self._http_async_client
+        }
+        self.llm = ChatOpenAI(model=llm_config["model"], **client_settings)
+        # Small model for chat replies; SQL planning and generation stay on self.llm
+        self.llm_small = ChatOpenAI(model=llm_config["small_model"], **client_settings)
+        
+        # Structured-output view of the LLM for fused routing + SQL generation
+        self.planner = self.llm.with_structured_output(OperationPlan)
+        # Structured-output view for table-name extraction when the matchers find nothing
+        self.table_extractor = self.llm.with_structured_output(TableExtraction)
+        # Plans requested by concurrent conversations go out as one abatch call
+        self._plan_batcher = LLMBatcher(
+            self.planner,
+            max_batch_size=AgentConfig.LLM_BATCH_SIZE,
+            window=AgentConfig.LLM_BATCH_WINDOW,
+            max_concurrency=AgentConfig.LLM_MAX_CONCURRENCY
+        )
+        # Final replies of concurrent turns are coalesced the same way
+        self._response_batcher = LLMBatcher(
+            self.llm_small,
+            max_batch_size=AgentConfig.LLM_BATCH_SIZE,
+            window=AgentConfig.LLM_BATCH_WINDOW,
+            max_concurrency=AgentConfig.LLM_MAX_CONCURRENCY
         )
+        # Repeated user turns against an unchanged schema reuse their plan (LRU order)
+        self._plan_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
         
         # Initialize database connection
         self.engine = self.config.create_database_engine()
         self.SessionLocal = self.config.create_session_factory(self.engine)
         self.db_type = self.config.detect_database_type(self.engine)
-        print(f"Database type detected: {self.db_type}")
+        logger.debug("Database type detected: %s", self.db_type)
         
         # Initialize database tools
         self.db_tools = DatabaseTools(self.engine, self.db_type)
         
+        # Existing table names, reused for SCHEMA_CACHE_TTL seconds or until DDL
+        self._table_names: Optional[List[str]] = None
+        self._table_names_at = 0.0
+        
+        # Word-boundary matcher over existing table names; rebuilt when they change
+        self._table_regex = None
+        self._table_names_by_lower: Dict[str, str] = {}
+        
+        # get_database_info overview as (fetched_at, info), dropped after DDL
+        self._database_info_cache: Optional[tuple] = None
+        # (tables dict, summary text) for the last summarized get_database_info result
+        self._schema_summary_cache: Optional[tuple] = None
+        # Table name -> (columns list, column name frozenset, joined names) for validation
+        self._column_set_cache: Dict[str, tuple] = {}
+        
+        # Table schemas keyed by name: (fetched_at, schema), warmed up front
+        self._schema_cache: Dict[str, tuple] = {}
+        self._warm_schema_cache()
+        
         # Initialize memory saver for LangGraph conversation history
         self.memory = MemorySaver()
         
-        # System prompt for the AI
+        # Event loop for the blocking chat() wrapper; reused so the async HTTP
+        # client's pooled connections and the batchers stay on one loop between turns
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # System prompt for the AI; the message is immutable and first in every
+        # response request, so it also forms a stable prefix for provider prompt caching
         self.system_prompt = SYSTEM_PROMPT
+        self._system_message = SystemMessage(content=self.system_prompt)
 
         # Initialize LangGraph workflow
         self._setup_workflow()
     
     def _setup_workflow(self) -> None:
         """
-        Set up LangGraph workflow for conversation management with human-in-the-loop.
+        Bind this agent and its checkpointer to the class-wide compiled workflow.
+        
+        The graph itself is compiled once per class; each agent gets a copy carrying
+        its own MemorySaver and itself in the run config.
+        """
+        self.workflow = type(self)._get_compiled_workflow().copy(
+            update={"checkpointer": self.memory}
+        ).with_config(configurable={"agent": self})
+    
+    @classmethod
+    def _get_compiled_workflow(cls):
+        """Get the compiled workflow for this class, compiling it on first use."""
+        if "_compiled_workflow" not in cls.__dict__:
+            cls._compiled_workflow = cls._build_workflow()
+        return cls._compiled_workflow
+    
+    @classmethod
+    def _build_workflow(cls):
+        """
+        Build the LangGraph workflow for conversation management with human-in-the-loop.
         
         Creates a state graph that uses LLM to decide next actions and includes
-        human approval for dangerous database operations.
+        human approval for dangerous database operations. Nodes and edges look up
+        the agent from the run config, so the compiled graph is shared.
         """
         workflow = StateGraph(ConversationState)
         
         # Add nodes
-        workflow.add_node("router", self._llm_router)
-        workflow.add_node("database_operation", self._database_operation)
-        workflow.add_node("human_approval", self._human_approval)
-        workflow.add_node("response", self._generate_response)
+        workflow.add_node("router", _bind_agent(cls._llm_router))
+        workflow.add_node("database_operation", _bind_agent(cls._database_operation))
+        workflow.add_node("human_approval", _bind_agent(cls._human_approval))
+        workflow.add_node("response", _bind_agent(cls._generate_response))
         
         # Set entry point
         workflow.set_entry_point("router")
@@ -117,7 +397,7 @@ class DatabaseAgent:
         # Add conditional edges based on LLM decision
         workflow.add_conditional_edges(
             "router",
-            self._should_continue,
+            _bind_agent(cls._should_continue),
             {
                 "database_operation": "database_operation",
                 "response": "response",
@@ -128,7 +408,7 @@ class DatabaseAgent:
         # Add conditional edges from database_operation
         workflow.add_conditional_edges(
             "database_operation",
-            self._needs_human_approval,
+            _bind_agent(cls._needs_human_approval),
             {
                 "human_approval": "human_approval",
                 "response": "response"
@@ -138,7 +418,7 @@ class DatabaseAgent:
         # Add conditional edges from human_approval
         workflow.add_conditional_edges(
             "human_approval",
-            self._handle_human_decision,
+            _bind_agent(cls._handle_human_decision),
             {
                 "database_operation": "database_operation",
                 "response": "response",
@@ -148,10 +428,10 @@ class DatabaseAgent:
         
         workflow.add_edge("response", END)
         
-        # Compile with memory checkpointer
-        self.workflow = workflow.compile(checkpointer=self.memory)
+        # Compiled without a checkpointer; _setup_workflow attaches each agent's memory
+        return workflow.compile()
     
-    def _llm_router(self, state: ConversationState) -> ConversationState:
+    async def _llm_router(self, state: ConversationState) -> ConversationState:
         """
         Use LLM to decide what action to take next.
         
@@ -161,35 +441,118 @@ class DatabaseAgent:
         Returns:
             Updated state with next action decision
         """
-        print("<=== _llm_router ===>")
+        logger.debug("<=== _llm_router ===>")
         messages = state["messages"]
         last_message = messages[-1].content if messages else ""
         
         # LangGraph automatically manages conversation history through the state
         
-        router_prompt = get_router_prompt(last_message)
+        # Intent and matched tables are worked out once here and read downstream
+        user_lower = last_message.lower()
+        is_create_request = any(keyword in user_lower for keyword in CREATE_REQUEST_KEYWORDS)
+        state["intent"] = "create_table" if is_create_request else "sql_op"
+        state["tables"] = None
+        
+        # Obvious turns need no routing call; the database node plans SQL itself
+        words = WORD_RE.findall(user_lower)
+        if DB_KEYWORDS.intersection(words):
+            state["tables"] = await self._match_table_names(last_message, user_lower, is_create_request) or None
+            state["next_action"] = "database_operation"
+            return state
+        if self._is_small_talk(words):
+            state["intent"] = "chat"
+            state["next_action"] = "response"
+            return state
         
-        try:
-            response = self.llm.invoke([
-                SystemMessage(content="You are a routing assistant. Respond with only the action name."),
-                HumanMessage(content=router_prompt)
-            ])
+        # One call decides the action and, for database work, the SQL as well
+        plan = await self._plan_operation(last_message)
+        if plan is None:
+            state["intent"] = "chat"
+            state["next_action"] = "response"  # Default to response on error
+            return state
+        
+        state["next_action"] = plan["action"]
+        if plan["action"] == "database_operation":
+            state["context"] = {"plan": plan}
+            state["tables"] = plan["tables"] or None
+        else:
+            state["intent"] = "chat"
+        
+        return state
+    
+    @staticmethod
+    def _is_small_talk(words: List[str]) -> bool:
+        """Check whether a tokenized message is a short greeting or thanks."""
+        return bool(words) and len(words) <= 3 and CHATTY_WORDS.issuperset(words)
+    
+    async def _plan_operation(self, user_message: str) -> Optional[Dict[str, Any]]:
+        """
+        Route the message and generate its SQL with a single structured LLM call.
+        
+        Args:
+            user_message: User's natural language query
             
-            action = response.content.strip().lower()
-            if action in ["database_operation", "response", "end"]:
-                state["next_action"] = action
+        Returns:
+            Plan dictionary with action, tables and sql, or None if the call failed
+        """
+        # Keep the user's casing: it carries literal values that end up in the SQL
+        normalized_message = " ".join(user_message.split())
+        
+        try:
+            schema_summary = await asyncio.to_thread(self._get_schema_summary)
+            key = (normalized_message, schema_summary)
+            plan = self._plan_cache.get(key)
+            if plan is None:
+                plan = await self._invoke_planner(normalized_message, schema_summary)
+                self._plan_cache[key] = plan
+                if len(self._plan_cache) > AgentConfig.PLAN_CACHE_SIZE:
+                    self._plan_cache.popitem(last=False)
             else:
-                state["next_action"] = "response"  # Default to response
-                
+                self._plan_cache.move_to_end(key)
+            logger.debug("🤖 Plan: %s", plan)
+            return dict(plan)
         except Exception as e:
-            print(f"❌ LLM Router Error: {str(e)}")
+            logger.error("❌ LLM Planning Error: %s", e)
             if "401" in str(e) or "User not found" in str(e):
-                print("🔑 API Authentication Error: Please check your OpenRouter API key")
-                print("   - Make sure OPENROUTER_API_KEY06 is set correctly in .env file")
-                print("   - Verify the API key is valid and has sufficient credits")
-            state["next_action"] = "response"  # Default to response on error
+                logger.error("🔑 API Authentication Error: Please check your OpenRouter API key")
+                logger.error("   - Make sure OPENROUTER_API_KEY06 is set correctly in .env file")
+                logger.error("   - Verify the API key is valid and has sufficient credits")
+            return None
+    
+    async def _invoke_planner(self, user_message: str, schema_summary: str) -> Dict[str, Any]:
+        """Call the planner LLM; results are cached by _plan_operation."""
+        plan = await self._plan_batcher.submit([
+            PLAN_SYSTEM_MESSAGE,
+            HumanMessage(content=get_plan_prompt(user_message, self.db_type.upper(), schema_summary))
+        ])
+        return plan.model_dump()
+    
+    def _get_schema_summary(self, database_info: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Get a compact one-line-per-table schema listing for LLM prompts.
         
-        return state
+        The text is rebuilt only when get_database_info returns a new result.
+        
+        Args:
+            database_info: get_database_info result to summarize, the current one if None
+            
+        Returns:
+            Table and column listing, or a note that the database is empty
+        """
+        tables = (database_info or self.get_database_info()).get("tables", {})
+        cached = self._schema_summary_cache
+        if cached is not None and cached[0] is tables:
+            return cached[1]
+        
+        if not tables:
+            summary = "(no tables yet)"
+        else:
+            summary = "\n".join(
+                f"- {table}(" + ", ".join(f"{col['name']} {col['type']}" for col in info["columns"]) + ")"
+                for table, info in tables.items()
+            )
+        self._schema_summary_cache = (tables, summary)
+        return summary
     
     def _should_continue(self, state: ConversationState) -> str:
         """Return the next action based on LLM decision."""
@@ -202,14 +565,14 @@ class DatabaseAgent:
         context = state.get("context", {})
         sql_query = context.get("sql_query") or context.get("sql_executed")
 
-        print(f"<=== _needs_human_approval ===> sql_query: {sql_query}, requires_approval: {context.get('requires_approval')}")
+        logger.debug("<=== _needs_human_approval ===> sql_query: %s, requires_approval: %s", sql_query, context.get('requires_approval'))
 
         # Check if this operation requires human approval
         if context.get("requires_approval") and sql_query:
-            print(f"⚠️ Human approval needed for: {sql_query}")
+            logger.warning("⚠️ Human approval needed for: %s", sql_query)
             return "human_approval"
 
-        print("✅ No human approval needed")
+        logger.debug("✅ No human approval needed")
         return "response"
 
     
@@ -223,33 +586,33 @@ class DatabaseAgent:
         Returns:
             Updated state with human approval decision
         """
-        print("<=== _human_approval ===>")
+        logger.debug("<=== _human_approval ===>")
         context = state.get("context", {})
         pending_query = context.get("sql_executed", "")
         
-        print(f"Pending query: {pending_query}")
-        print(f"State keys: {list(state.keys())}")
-        print(f"Context: {context}")
+        logger.debug("Pending query: %s", pending_query)
+        logger.debug("State keys: %s", list(state.keys()))
+        logger.debug("Context: %s", context)
         
         if not pending_query:
-            print("❌ No pending query found")
+            logger.error("❌ No pending query found")
             state["human_approval"] = False
             return state
         
         # Check if this is a dangerous operation that needs approval
-        if not simple_approval_manager.is_dangerous_operation(pending_query):
+        if not self._is_dangerous(pending_query):
             state["human_approval"] = True
             return state
         
         # Create approval request using the simple manager
-        print(f"🔧 Creating approval request for: {pending_query}")
+        logger.debug("🔧 Creating approval request for: %s", pending_query)
         approval_result = simple_approval_manager.create_approval_request(
             sql_query=pending_query
         )
         
         approval_id = approval_result["approval_id"]
         state["approval_id"] = approval_id
-        print(f"🔧 Created approval with ID: {approval_id}")
+        logger.debug("🔧 Created approval with ID: %s", approval_id)
         
         # Get operation info from the approval result
         approval_request = approval_result["approval_request"]
@@ -282,7 +645,7 @@ This operation could modify or delete data in your database. Please review the q
             "approval_id": approval_id
         }
         
-        print(f"🔧 Set context with approval message: {approval_message[:100]}...")
+        logger.debug("🔧 Set context with approval message: %s...", approval_message[:100])
         
         # Set human approval as pending
         state["human_approval"] = None  # Pending approval
@@ -290,6 +653,22 @@ This operation could modify or delete data in your database. Please review the q
         
         return state
     
+    @staticmethod
+    def _is_dangerous(sql_query: str) -> bool:
+        """
+        Check whether a SQL statement needs human approval.
+        
+        Uses the approval module's memoized classifier, so the patterns are
+        compiled and each distinct statement classified only once per process.
+        
+        Args:
+            sql_query: SQL statement to check
+            
+        Returns:
+            True if the statement is dangerous
+        """
+        return is_dangerous_sql(sql_query)
+    
     def _handle_human_decision(self, state: ConversationState) -> str:
         """
         Handle the human approval decision.
@@ -320,11 +699,11 @@ This operation could modify or delete data in your database. Please review the q
             return "response"
         else:
             # still pending -> go to response to show approval message
-            print("⏳ Approval still pending, showing approval message")
+            logger.warning("⏳ Approval still pending, showing approval message")
             return "response"
 
         
-    def _database_operation(self, state: ConversationState) -> ConversationState:
+    async def _database_operation(self, state: ConversationState) -> ConversationState:
         """
         Simplified database operation handler.
         Uses LLM to understand user intent and execute SQL safely in real-time.
@@ -334,17 +713,16 @@ This operation could modify or delete data in your database. Please review the q
             - Generates accurate SQL
             - Executes safely with optional human approval
         """
-        print("<=== _database_operation ===>")
+        logger.debug("<=== _database_operation ===>")
 
         messages = state.get("messages", [])
         last_message = messages[-1].content if messages else ""
-        engine = self.engine
 
         try:
             # --- STEP 1: Handle human approval flow --------------------------
             if state.get("human_approval") is True and state.get("context", {}).get("sql_executed"):
                 sql_query = state["context"]["sql_executed"]
-                result = self.execute_sql_query(sql_query)
+                result = await self.aexecute_sql_query(sql_query)
                 operation_result = (
                     f"✅ Executed approved query successfully:\n```sql\n{sql_query}\n```\n"
                     if result.get("success")
@@ -355,153 +733,27 @@ This operation could modify or delete data in your database. Please review the q
                 return state
 
             if state.get("human_approval") is False:
-                state["context"] = {"operation_result": "❌ Operation cancelled by user."}
+                state["context"] = {"operation_result": "❌ Operation cancelled by user.", "skip_llm": True}
                 state["human_approval"] = None
                 return state
 
-            # --- STEP 2: Check if this is a CREATE TABLE request -------------
-            user_lower = last_message.lower()
-            is_create_request = any(keyword in user_lower for keyword in [
-                'create table', 'make table', 'add table', 'new table', 
-                'create a table', 'table name', 'database name'
-            ])
-            
-            if is_create_request:
-                # --- CREATE TABLE FLOW ----------------------------------------
-                print("🔨 Processing CREATE TABLE request...")
-                
-                # Extract table name and columns from the request
-                mentioned_tables = self._extract_table_names_from_query(last_message)
-                print(f"🔍 Table to create: {mentioned_tables}")
-                
-                if not mentioned_tables:
-                    state["context"] = {
-                        "operation_result": "❌ Could not detect table name in your CREATE TABLE request. Please specify the table name clearly."
-                    }
-                    return state
-                
-                table_name = mentioned_tables[0]
-                
-                # Generate CREATE TABLE SQL using LLM
-                create_prompt = f"""
-You are an expert SQL assistant for {self.db_type.upper()} database.
-
-User Request: "{last_message}"
-
-Database Type: {self.db_type.upper()}
-
-Instructions:
-1. Extract the table name and column names from the user's request
-2. Generate a proper CREATE TABLE SQL statement
-3. Use appropriate data types for {self.db_type.upper()}
-4. Include common constraints (PRIMARY KEY, NOT NULL, etc.)
-5. Return ONLY the SQL statement
-
-Common data types for {self.db_type.upper()}:
-- INTEGER or SERIAL (for auto-incrementing IDs)
-- VARCHAR(255) or TEXT (for text fields)
-- TIMESTAMP (for dates)
-- BOOLEAN (for true/false values)
-
-Examples:
-- "create table users with id, name, email, password" → CREATE TABLE users (id SERIAL PRIMARY KEY, name VARCHAR(255) NOT NULL, email VARCHAR(255) UNIQUE, password VARCHAR(255) NOT NULL);
-- "table name employ with columns id, name, email, password" → CREATE TABLE employ (id SERIAL PRIMARY KEY, name VARCHAR(255) NOT NULL, email VARCHAR(255), password VARCHAR(255) NOT NULL);
-
-Generate the CREATE TABLE SQL for: {table_name}
-"""
-                
-                llm_messages = [
-                    SystemMessage(content="You are a SQL generation assistant. Return only the SQL statement."),
-                    HumanMessage(content=create_prompt)
-                ]
-                
-                print("🤖 Generating CREATE TABLE SQL...")
-                llm_response = self.llm.invoke(llm_messages)
-                raw_output = getattr(llm_response, "content", str(llm_response))
-                print(f"🤖 Raw LLM output: {raw_output[:300]}")
-                
-                sql_query = self._extract_sql_from_text(raw_output)
-                
-                if not sql_query:
-                    raise ValueError("No valid CREATE TABLE SQL found in LLM output.")
-                
-                print(f"✅ Generated CREATE TABLE SQL: {sql_query}")
-                
-            else:
-                # --- EXISTING TABLE OPERATIONS FLOW ---------------------------
-                print("🔍 Processing existing table operation...")
-                
-                # Extract mentioned tables
-                mentioned_tables = self._extract_table_names_from_query(last_message)
-                print(f"🔍 Mentioned tables: {mentioned_tables}")
-
-                if not mentioned_tables:
-                    state["context"] = {
-                        "operation_result": "❌ Could not detect any table name in your request."
-                    }
-                    return state
-
-                # Get schema for mentioned tables
-                print("📋 Fetching table schemas...")
-                schemas = {}
-                for table in mentioned_tables:
-                    try:
-                        schema = get_table_schema(engine, table)
-                        schemas[table] = schema
-                        print(f"✅ Got schema for table '{table}': {len(schema)} columns")
-                    except Exception as e:
-                        schemas[table] = {"error": str(e)}
-                        print(f"⚠️ Failed to get schema for table '{table}': {e}")
-
-                # Prepare schema prompt for LLM
-                schema_text = []
-                for table, schema in schemas.items():
-                    if "error" in schema:
-                        schema_text.append(f"❌ Table '{table}' not found or inaccessible.")
-                        continue
-
-                    schema_text.append(f"📋 TABLE: {table}")
-                    for col in schema:
-                        schema_text.append(f"  • {col['column_name']} ({col['data_type']})")
-                    schema_text.append("")
-
-                formatted_schema = "\n".join(schema_text)
-
-                schema_prompt = (
-                    "You are an expert SQL assistant.\n"
-                    "Follow these CRITICAL RULES:\n"
-                    "1. Use ONLY the tables and columns listed below.\n"
-                    "2. Do NOT invent new columns or tables.\n"
-                    "3. For INSERT/UPDATE, include all NOT NULL columns.\n"
-                    "4. For ALTER, use correct column names and types.\n"
-                    "5. Always output VALID SQL syntax for the database type.\n\n"
-                    f"{formatted_schema}\n\n"
-                    "Now, based on this schema, generate a single SQL statement for the user's request."
+            # --- STEP 2: Generate SQL ----------------------------------------
+            sql_query = await self._sql_from_plan(state, last_message)
+            if not sql_query:
+                # Planner gave no SQL; fall back to extraction + generation
+                intent = state.get("intent")
+                sql_query, error_context = await self._generate_sql_stepwise(
+                    last_message,
+                    is_create_request=intent == "create_table" if intent else None,
+                    tables=state.get("tables")
                 )
-
-                user_context = f"User request: {last_message}"
-
-                # Ask LLM to generate SQL
-                llm_messages = [
-                    SystemMessage(content=schema_prompt),
-                    HumanMessage(content=user_context)
-                ]
-
-                print("🤖 Sending to LLM for SQL generation...")
-                llm_response = self.llm.invoke(llm_messages)
-                raw_output = getattr(llm_response, "content", str(llm_response))
-                print(f"🤖 Raw LLM output: {raw_output[:300]}")
-
-                sql_query = self._extract_sql_from_text(raw_output)
-
-                if not sql_query:
-                    raise ValueError("No valid SQL found in LLM output.")
-
-                print(f"✅ Extracted SQL: {sql_query}")
+                if error_context:
+                    state["context"] = {**error_context, "skip_llm": True}
+                    return state
 
             # --- STEP 3: Safety check (approval) ------------------------------
-            if simple_approval_manager.is_dangerous_operation(sql_query):
-                print(f"⚠️ Dangerous operation detected: {sql_query}")
+            if self._is_dangerous(sql_query):
+                logger.warning("⚠️ Dangerous operation detected: %s", sql_query)
                 state["context"] = {
                     "operation_result": f"⚠️ Dangerous operation detected:\n```sql\n{sql_query}\n```",
                     "sql_executed": sql_query,
@@ -510,9 +762,13 @@ Generate the CREATE TABLE SQL for: {table_name}
                 return state
 
             # --- STEP 4: Execute SQL safely -----------------------------------
-            result = self.execute_sql_query(sql_query)
+            result = await self.aexecute_sql_query(sql_query, _parse_sql(sql_query))
 
-            if result.get("success"):
+            # Small SELECT results and DDL confirmations are already user-ready
+            ready_message = self._format_ready_result(sql_query, result)
+            if ready_message:
+                operation_result = ready_message
+            elif result.get("success"):
                 operation_result = f"✅ Query executed successfully!\n```sql\n{sql_query}\n```"
             else:
                 operation_result = f"❌ SQL Execution Failed:\n```sql\n{sql_query}\n```\nError: {result.get('error')}"
@@ -522,13 +778,12 @@ Generate the CREATE TABLE SQL for: {table_name}
                 "operation_result": operation_result,
                 "sql_executed": sql_query,
                 "sql_generated": sql_query,
-                "execution_successful": result.get("success", False)
+                "execution_successful": result.get("success", False),
+                "skip_llm": ready_message is not None
             }
 
         except Exception as e:
-            print(f"❌ Error in _database_operation: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Error in _database_operation: %s", e)
 
             state["context"] = {
                 "operation_result": f"❌ Error: {str(e)}",
@@ -538,6 +793,201 @@ Generate the CREATE TABLE SQL for: {table_name}
 
         return state
 
+    @staticmethod
+    def _format_ready_result(sql_query: str, result: Dict[str, Any]) -> Optional[str]:
+        """
+        Format a successful result that can be shown to the user as is.
+        
+        Args:
+            sql_query: Executed SQL query
+            result: Result of execute_sql_query
+            
+        Returns:
+            Templated message for a SELECT of at most AgentConfig.MAX_TABLE_ROWS_DISPLAY
+            rows or a CREATE/ALTER/DROP TABLE, otherwise None so the LLM words the reply
+        """
+        if not result.get("success"):
+            return None
+        
+        verb = result.get("query_type")
+        if verb in DDL_VERBS:
+            # The templates speak of tables; indexes, views, users etc. are worded by the LLM
+            return get_result_message(verb, sql_query) if _parse_sql(sql_query).table else None
+        if verb != "SELECT" or result["truncated"] or result["row_count"] > AgentConfig.MAX_TABLE_ROWS_DISPLAY:
+            return None
+        
+        if not result["data"]:
+            return get_result_message(verb, sql_query, 0, "No rows found.")
+        
+        def cell(value: Any) -> str:
+            return "NULL" if value is None else str(value).replace("|", "\\|").replace("\n", " ")
+        
+        lines = [
+            "| " + " | ".join(map(cell, result["columns"])) + " |",
+            "|" + " --- |" * len(result["columns"])
+        ]
+        lines.extend("| " + " | ".join(map(cell, row)) + " |" for row in result["data"])
+        return get_result_message(verb, sql_query, result["row_count"], "\n".join(lines))
+    
+    async def _sql_from_plan(self, state: ConversationState, user_message: str) -> str:
+        """
+        Get the SQL planned by the router, planning now if the router was skipped.
+        
+        Args:
+            state: Current conversation state
+            user_message: User's natural language query
+            
+        Returns:
+            Planned SQL query or empty string if the plan has none
+        """
+        plan = (state.get("context") or {}).get("plan")
+        if plan is None:
+            plan = await self._plan_operation(user_message)
+            if plan and plan["tables"] and not state.get("tables"):
+                state["tables"] = plan["tables"]
+        
+        sql_query = ((plan or {}).get("sql") or "").strip()
+        if sql_query.startswith("```"):
+            sql_query = self._extract_sql_from_text(sql_query)
+        
+        if sql_query:
+            logger.debug("✅ Planned SQL: %s", sql_query)
+        return sql_query
+    
+    async def _generate_sql_stepwise(self, last_message: str, is_create_request: Optional[bool] = None,
+                                     tables: Optional[List[str]] = None):
+        """
+        Generate SQL by extracting table names and then prompting for the statement.
+        
+        Used when the fused plan did not produce SQL.
+        
+        Args:
+            last_message: User's natural language query
+            is_create_request: CREATE TABLE intent from the router, detected here if None
+            tables: Table names matched by the router, if any
+            
+        Returns:
+            Tuple of (sql_query, None) on success or (None, error_context) when no table was found
+        """
+        if is_create_request is None:
+            is_create_request = any(keyword in last_message.lower() for keyword in CREATE_REQUEST_KEYWORDS)
+        
+        if is_create_request:
+            # --- CREATE TABLE FLOW ----------------------------------------
+            logger.debug("🔨 Processing CREATE TABLE request...")
+            
+            # Extract table name and columns from the request
+            mentioned_tables = await self._extract_table_names_from_query(last_message, is_create_request, tables)
+            logger.debug("🔍 Table to create: %s", mentioned_tables)
+            
+            if not mentioned_tables:
+                return None, {
+                    "operation_result": "❌ Could not detect table name in your CREATE TABLE request. Please specify the table name clearly."
+                }
+            
+            table_name = mentioned_tables[0]
+            
+            # Generate CREATE TABLE SQL using LLM
+            llm_messages = [
+                CREATE_TABLE_SYSTEM_MESSAGE,
+                HumanMessage(content=(
+                    f"Database type: {self.db_type.upper()}\n"
+                    f"Table to create: {table_name}\n"
+                    f"User request: {last_message}"
+                ))
+            ]
+            
+            logger.debug("🤖 Generating CREATE TABLE SQL...")
+            raw_output = await self._astream_sql(llm_messages)
+            logger.debug("🤖 Raw LLM output: %s", raw_output[:300])
+            
+            sql_query = self._extract_sql_from_text(raw_output)
+            
+            if not sql_query:
+                raise ValueError("No valid CREATE TABLE SQL found in LLM output.")
+            
+            logger.debug("✅ Generated CREATE TABLE SQL: %s", sql_query)
+            
+        else:
+            # --- EXISTING TABLE OPERATIONS FLOW ---------------------------
+            logger.debug("🔍 Processing existing table operation...")
+            
+            # Extract mentioned tables
+            mentioned_tables = await self._extract_table_names_from_query(last_message, is_create_request, tables)
+            logger.debug("🔍 Mentioned tables: %s", mentioned_tables)
+
+            if not mentioned_tables:
+                return None, {
+                    "operation_result": "❌ Could not detect any table name in your request."
+                }
+
+            # Get schema for mentioned tables, introspecting them concurrently
+            logger.debug("📋 Fetching table schemas...")
+            results = await asyncio.gather(
+                *(asyncio.to_thread(self._cached_schema, table) for table in mentioned_tables),
+                return_exceptions=True
+            )
+            schemas = {}
+            for table, schema in zip(mentioned_tables, results):
+                if isinstance(schema, Exception):
+                    schemas[table] = {"error": str(schema)}
+                    logger.warning("⚠️ Failed to get schema for table '%s': %s", table, schema)
+                else:
+                    schemas[table] = schema
+                    logger.debug("✅ Got schema for table '%s': %s columns", table, len(schema))
+
+            # One line per table; column types only when writing data or altering
+            with_types = WRITE_INTENT_RE.search(last_message) is not None
+            formatted_schema = "\n".join(
+                f"{table}: not found or inaccessible" if "error" in schema
+                else f"{table}(" + ", ".join(
+                    f"{col['column_name']} {col['data_type']}" if with_types else col['column_name']
+                    for col in schema
+                ) + ")"
+                for table, schema in schemas.items()
+            )
+
+            # Ask LLM to generate SQL
+            llm_messages = [
+                SQL_SYSTEM_MESSAGE,
+                HumanMessage(content=(
+                    f"Database type: {self.db_type.upper()}\n"
+                    f"Schema:\n{formatted_schema}\n\n"
+                    f"User request: {last_message}"
+                ))
+            ]
+
+            logger.debug("🤖 Sending to LLM for SQL generation...")
+            raw_output = await self._astream_sql(llm_messages)
+            logger.debug("🤖 Raw LLM output: %s", raw_output[:300])
+
+            sql_query = self._extract_sql_from_text(raw_output)
+
+            if not sql_query:
+                raise ValueError("No valid SQL found in LLM output.")
+
+            logger.debug("✅ Extracted SQL: %s", sql_query)
+
+        return sql_query, None
+
+    async def _astream_sql(self, llm_messages: List[Any]) -> str:
+        """
+        Stream SQL generation and stop as soon as the fenced SQL block is closed.
+        
+        Args:
+            llm_messages: Messages for the SQL generation call
+            
+        Returns:
+            Raw LLM output up to and including the closing backticks
+        """
+        buffer = ""
+        async for chunk in self.llm.astream(llm_messages):
+            buffer += chunk.content
+            # A block can only close on a chunk carrying a backtick
+            if "`" in chunk.content and SQL_BLOCK_RE.search(buffer):
+                break
+        return buffer
+
     def _extract_sql_from_text(self, text: str) -> str:
         """
         Extract SQL query from LLM response text.
@@ -548,24 +998,20 @@ Generate the CREATE TABLE SQL for: {table_name}
         Returns:
             Extracted SQL query or empty string if not found
         """
-        import re
+        text_upper = text.upper()
+        if '```' not in text and not any(keyword in text_upper for keyword in SQL_VERBS):
+            return ""
         
         # Look for SQL code blocks first
-        sql_patterns = [
-            r'```sql\s*(.*?)\s*```',  # ```sql ... ```
-            r'```\s*(SELECT|INSERT|UPDATE|DELETE|CREATE|DROP|ALTER|WITH).*?```',  # ``` ... ``` with SQL keywords
-        ]
-        
-        for pattern in sql_patterns:
-            matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
+        for pattern in (SQL_FENCED_RE, SQL_FENCED_KEYWORD_RE):
+            matches = pattern.findall(text)
             if matches:
                 sql = matches[0].strip()
                 if sql:
                     return sql
         
         # Look for CREATE TABLE statements specifically (they can be multi-line)
-        create_pattern = r'(CREATE\s+TABLE\s+.*?)(?=\n\n|\n$|$|;)'
-        create_matches = re.findall(create_pattern, text, re.DOTALL | re.IGNORECASE)
+        create_matches = CREATE_STATEMENT_RE.findall(text)
         if create_matches:
             sql = create_matches[0].strip()
             if sql:
@@ -575,44 +1021,134 @@ Generate the CREATE TABLE SQL for: {table_name}
                 return sql
         
         # Look for other SQL statements
-        other_sql_pattern = r'(SELECT|INSERT|UPDATE|DELETE|DROP|ALTER|WITH).*?(?=\n\n|\n$|$|;)'
-        other_matches = re.findall(other_sql_pattern, text, re.DOTALL | re.IGNORECASE)
+        other_matches = OTHER_STATEMENT_RE.findall(text)
         if other_matches:
             sql = other_matches[0].strip()
             if sql:
                 return sql
         
         # If no pattern matches, try to find any SQL-like statement in lines
-        lines = text.split('\n')
-        for line in lines:
+        for line in text.split('\n'):
             line = line.strip()
-            if any(keyword in line.upper() for keyword in ['SELECT', 'INSERT', 'UPDATE', 'DELETE', 'CREATE', 'DROP', 'ALTER', 'WITH']):
+            if any(keyword in line.upper() for keyword in SQL_VERBS):
                 return line
         
         return ""
 
-    def _extract_table_names_from_query(self, user_message: str) -> List[str]:
+    async def _extract_table_names_from_query(self, user_message: str, is_create_request: Optional[bool] = None,
+                                              tables: Optional[List[str]] = None) -> List[str]:
         """
-        Extract table names from user query using LLM for intelligent parsing.
+        Extract table names from user query, using the LLM only when matching fails.
         Handles both existing tables and new table creation requests.
         
         Args:
             user_message: User's natural language query
+            is_create_request: CREATE TABLE intent if already known, detected here if None
+            tables: Table names already matched by the router, returned as-is
             
         Returns:
             List of table names mentioned in the query
         """
+        if tables:
+            return list(tables)
+        
         try:
-            # Check if this is a CREATE TABLE request first
             user_lower = user_message.lower()
-            is_create_request = any(keyword in user_lower for keyword in [
-                'create table', 'make table', 'add table', 'new table', 
-                'create a table', 'table name', 'database name'
-            ])
+            if is_create_request is None:
+                is_create_request = any(keyword in user_lower for keyword in CREATE_REQUEST_KEYWORDS)
+            
+            matched = await self._match_table_names(user_message, user_lower, is_create_request)
+            if matched:
+                return matched
+            
+            return await self._llm_extract_table_names(user_message, is_create_request)
+            
+        except Exception as e:
+            logger.error("Error extracting table names: %s", e)
+            return []
+    
+    async def _match_table_names(self, user_message: str, user_lower: str, is_create_request: bool) -> List[str]:
+        """
+        Match table names without the LLM: the name to create, or existing tables mentioned.
+        
+        Args:
+            user_message: User's natural language query
+            user_lower: The same query lower-cased
+            is_create_request: Whether the query asks to create a new table
+            
+        Returns:
+            List of matched table names, empty if nothing matched
+        """
+        if is_create_request:
+            table_name = self._match_create_table_name(user_lower)
+            return [table_name] if table_name else []
+        
+        table_regex = await asyncio.to_thread(self._get_table_regex)
+        if table_regex is None:
+            return []
+        return list(dict.fromkeys(
+            self._table_names_by_lower[name.lower()]
+            for name in table_regex.findall(user_message)
+        ))
+    
+    def _match_create_table_name(self, user_lower: str) -> Optional[str]:
+        """Return the table name a lower-cased CREATE request asks for, if a pattern finds it."""
+        for pattern in CREATE_TABLE_NAME_PATTERNS:
+            match = pattern.search(user_lower)
+            if match:
+                return match.group(1)
+        return None
+    
+    def _get_table_names(self) -> List[str]:
+        """
+        Get existing table names, listing them again once the cached copy expires.
+        
+        Returns:
+            List of table names
+        """
+        now = time.monotonic()
+        if self._table_names is None or now - self._table_names_at >= AgentConfig.SCHEMA_CACHE_TTL:
+            tables = self.db_tools.get_all_table_names()
+            if tables != self._table_names:
+                self._table_regex = None
+            self._table_names = tables
+            self._table_names_at = now
+        return self._table_names
+    
+    def _get_table_regex(self):
+        """
+        Get the compiled matcher for existing table names, building it if needed.
+        
+        Longer names come first so "order_items" wins over "order".
+        
+        Returns:
+            Compiled pattern, or None if the database has no tables
+        """
+        tables = self._get_table_names()
+        if self._table_regex is None:
+            if not tables:
+                return None
+            self._table_names_by_lower = {table.lower(): table for table in tables}
+            self._table_regex = re.compile(
+                r'\b(' + '|'.join(map(re.escape, sorted(tables, key=len, reverse=True))) + r')\b',
+                re.IGNORECASE
+            )
+        return self._table_regex
+    
+    async def _llm_extract_table_names(self, user_message: str, is_create_request: bool) -> List[str]:
+        """
+        Ask the LLM for the table names in a query the matchers could not resolve.
+        
+        Args:
+            user_message: User's natural language query
+            is_create_request: Whether the query asks to create a new table
             
-            if is_create_request:
-                # For CREATE TABLE requests, extract the table name to be created
-                extraction_prompt = f"""
+        Returns:
+            List of table names mentioned in the query
+        """
+        if is_create_request:
+            # For CREATE TABLE requests, extract the table name to be created
+            extraction_prompt = f"""
 You are a database assistant. Extract table names from CREATE TABLE requests.
 
 User Query: "{user_message}"
@@ -620,8 +1156,8 @@ User Query: "{user_message}"
 Instructions:
 1. If this is a CREATE TABLE request, extract the table name that the user wants to create
 2. Look for patterns like "create table X", "table name X", "database name X", "new table X"
-3. Return ONLY the table name to be created as a JSON array
-4. If no table name is specified, return an empty array []
+3. Put ONLY the table name to be created in tables
+4. If no table name is specified, leave tables empty
 
 Examples:
 - "create a table name employ with columns id, name, email, password" → ["employ"]
@@ -629,13 +1165,11 @@ Examples:
 - "make a new table called products" → ["products"]
 - "table name admin and columns id, name" → ["admin"]
 - "database name customer with columns" → ["customer"]
-
-Return format: ["table_name"] or []
 """
-            else:
-                # For other operations, match against existing tables
-                available_tables = self.db_tools.get_all_table_names()
-                extraction_prompt = f"""
+        else:
+            # For other operations, match against existing tables
+            available_tables = await asyncio.to_thread(self._get_table_names)
+            extraction_prompt = f"""
 You are a database assistant. Extract table names from the user's query.
 
 User Query: "{user_message}"
@@ -645,64 +1179,25 @@ Available tables in database: {', '.join(available_tables)}
 Instructions:
 1. Identify any table names mentioned in the user's query
 2. Match them against available tables (case-insensitive)
-3. Return ONLY the table names as a JSON array
-4. If no specific table is mentioned, return an empty array []
+3. Put ONLY the table names in tables
+4. If no specific table is mentioned, leave tables empty
 
 Examples:
 - "add 5 columns to user table" → ["user"]
 - "show me data from users and orders" → ["users", "orders"]
 - "insert into customer table" → ["customer"]
-
-Return format: ["table1", "table2"] or []
 """
-            
-            try:
-                response = self.llm.invoke([
-                    SystemMessage(content="You are a table name extraction assistant. Return only JSON array."),
-                    HumanMessage(content=extraction_prompt)
-                ])
-                
-                # Parse the JSON response
-                import json
-                table_names = json.loads(response.content.strip())
-                return table_names if isinstance(table_names, list) else []
-            except Exception as llm_error:
-                print(f"❌ LLM Table Extraction Error: {str(llm_error)}")
-                if "401" in str(llm_error) or "User not found" in str(llm_error):
-                    print("🔑 API Authentication Error during table extraction")
-                    # Fall back to simple string matching
-                    if is_create_request:
-                        # For CREATE requests, try to extract table name using simple patterns
-                        import re
-                        patterns = [
-                            r'table\s+name\s+(\w+)',
-                            r'database\s+name\s+(\w+)',
-                            r'create\s+table\s+(\w+)',
-                            r'new\s+table\s+called?\s+(\w+)',
-                            r'make\s+table\s+(\w+)',
-                            r'add\s+table\s+(\w+)'
-                        ]
-                        for pattern in patterns:
-                            match = re.search(pattern, user_lower)
-                            if match:
-                                table_name = match.group(1)
-                                print(f"🔄 Fallback extraction found: [{table_name}]")
-                                return [table_name]
-                        return []
-                    else:
-                        # For other operations, match against existing tables
-                        available_tables = self.db_tools.get_all_table_names()
-                        extracted = []
-                        for table in available_tables:
-                            if table.lower() in user_lower:
-                                extracted.append(table)
-                        print(f"🔄 Fallback extraction found: {extracted}")
-                        return extracted
-                else:
-                    raise llm_error
-            
+        
+        try:
+            extraction = await self.table_extractor.ainvoke([
+                TABLE_EXTRACTION_SYSTEM_MESSAGE,
+                HumanMessage(content=extraction_prompt)
+            ])
+            return extraction.tables
         except Exception as e:
-            print(f"Error extracting table names: {e}")
+            logger.error("❌ LLM Table Extraction Error: %s", e)
+            if "401" in str(e) or "User not found" in str(e):
+                logger.error("🔑 API Authentication Error during table extraction")
             return []
     
     def _get_specific_table_schemas(self, table_names: List[str]) -> Dict[str, Any]:
@@ -719,16 +1214,56 @@ Return format: ["table1", "table2"] or []
         
         for table_name in table_names:
             try:
-                schema = get_table_schema(self.engine, table_name)
+                schema = self._cached_schema(table_name)
                 if not schema.get("error"):
                     table_schemas[table_name] = schema
                 else:
-                    print(f"Warning: Could not get schema for table '{table_name}': {schema.get('error')}")
+                    logger.warning("Warning: Could not get schema for table '%s': %s", table_name, schema.get('error'))
             except Exception as e:
-                print(f"Error getting schema for table '{table_name}': {e}")
+                logger.error("Error getting schema for table '%s': %s", table_name, e)
         
         return table_schemas
     
+    def _cached_schema(self, table_name: str, ttl: float = AgentConfig.SCHEMA_CACHE_TTL) -> List[Dict[str, str]]:
+        """
+        Get a table schema, reusing the cached copy while it is younger than ttl.
+        
+        Args:
+            table_name: Name of the table
+            ttl: Maximum age in seconds of a cached schema
+            
+        Returns:
+            Schema information from get_table_schema, or its error dict
+        """
+        now = time.monotonic()
+        entry = self._schema_cache.get(table_name)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+        
+        schema = get_table_schema(self.engine, table_name)
+        # Errors (missing table, lost connection) are retried on the next call, not cached
+        if isinstance(schema, list):
+            self._schema_cache[table_name] = (now, schema)
+        return schema
+    
+    def _warm_schema_cache(self) -> None:
+        """Load the schema of every existing table into the schema cache."""
+        try:
+            for table_name in self._get_table_names():
+                self._cached_schema(table_name)
+        except Exception as e:
+            logger.warning("⚠️ Could not warm schema cache: %s", e)
+    
+    def _invalidate_schema_cache(self, parsed: ParsedSQL) -> None:
+        """Drop cached schema data for a table changed by a CREATE/ALTER/DROP statement."""
+        if parsed.verb in DDL_VERBS and parsed.table:
+            self._schema_cache.pop(parsed.table, None)
+            self._database_info_cache = None
+            self._table_names = None
+            self._table_regex = None
+            self.db_tools.invalidate_cache()
+            invalidate_schema_cache(self.engine)
+    
     def _format_table_schema_for_llm(self, table_name: str, schema: List[Dict]) -> str:
         """
         Format table schema information for LLM consumption.
@@ -740,18 +1275,26 @@ Return format: ["table1", "table2"] or []
         Returns:
             Formatted string with table schema information
         """
-        if not schema or schema.get("error"):
+        if not schema or "error" in schema:
             return f"Table '{table_name}': Schema not available"
         
-        formatted = [f"📋 TABLE: {table_name}"]
-        formatted.append("  Columns:")
-        
-        for col in schema:
-            col_info = f"    • {col['column_name']} ({col['data_type']})"
-            formatted.append(col_info)
-        
-        return "\n".join(formatted)
+        columns = "\n".join(f"    • {col['column_name']} ({col['data_type']})" for col in schema)
+        return f"📋 TABLE: {table_name}\n  Columns:\n{columns}"
 
+    def _column_names(self, table_name: str, table_schema: Dict[str, Any]) -> Tuple[frozenset, str]:
+        """
+        Get a table's column names as a frozenset and as a comma-separated string.
+        
+        Both are reused until get_database_info returns a new column list for the table.
+        """
+        columns = table_schema.get('columns', [])
+        cached = self._column_set_cache.get(table_name)
+        if cached is None or cached[0] is not columns:
+            names = [col['name'] for col in columns]
+            cached = (columns, frozenset(names), ", ".join(names))
+            self._column_set_cache[table_name] = cached
+        return cached[1], cached[2]
+    
     def _validate_sql_against_schema(self, sql_query: str, db_schema: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate SQL query against the database schema.
@@ -764,32 +1307,11 @@ Return format: ["table1", "table2"] or []
             Dictionary with validation result and error details
         """
         try:
-            sql_upper = sql_query.upper().strip()
-            
-            # Extract table name from SQL
-            table_name = None
-            if sql_upper.startswith('INSERT INTO'):
-                # Extract table name from INSERT INTO table_name
-                parts = sql_query.split()
-                if len(parts) >= 3:
-                    table_name = parts[2].strip('`"[]()')
-            elif sql_upper.startswith('SELECT'):
-                # For SELECT queries, try to extract table names
-                # This is more complex, so we'll be more lenient
-                return {"valid": True, "error": None}
-            elif sql_upper.startswith('UPDATE'):
-                # Extract table name from UPDATE table_name
-                parts = sql_query.split()
-                if len(parts) >= 2:
-                    table_name = parts[1].strip('`"[]()')
-            elif sql_upper.startswith('DELETE FROM'):
-                # Extract table name from DELETE FROM table_name
-                parts = sql_query.split()
-                if len(parts) >= 3:
-                    table_name = parts[2].strip('`"[]()')
-            
-            if not table_name:
+            # Only INSERT, UPDATE and DELETE are validated; the target table must already exist
+            parsed = _parse_sql(sql_query)
+            if parsed.verb in DDL_VERBS or not parsed.table:
                 return {"valid": True, "error": None}  # Can't validate without table name
+            table_name = parsed.table
             
             # Get table schema
             table_schema = db_schema.get('tables', {}).get(table_name)
@@ -800,35 +1322,26 @@ Return format: ["table1", "table2"] or []
                     "available_columns": "Table not found"
                 }
             
-            # Get available columns
-            available_columns = [col['name'] for col in table_schema.get('columns', [])]
-            
-            # For INSERT statements, validate columns
-            if sql_upper.startswith('INSERT INTO'):
-                # Extract column names from INSERT statement
-                # Look for pattern: INSERT INTO table (col1, col2, ...) VALUES
-                import re
-                match = re.search(r'INSERT INTO\s+\w+\s*\(([^)]+)\)', sql_query, re.IGNORECASE)
-                if match:
-                    columns_str = match.group(1)
-                    used_columns = [col.strip().strip('`"[]()') for col in columns_str.split(',')]
-                    
-                    # Check if all used columns exist in schema
-                    invalid_columns = [col for col in used_columns if col not in available_columns]
-                    if invalid_columns:
-                        return {
-                            "valid": False,
-                            "error": f"Columns {invalid_columns} do not exist in table '{table_name}'",
-                            "available_columns": ", ".join(available_columns)
-                        }
+            # Get available columns, built once per schema refresh
+            available_column_set, available_columns = self._column_names(table_name, table_schema)
             
-            return {"valid": True, "error": None, "available_columns": ", ".join(available_columns)}
+            # For INSERT statements, validate the listed columns
+            if parsed.columns and not available_column_set.issuperset(parsed.columns):
+                # Report missing columns in the order they were used
+                invalid_columns = [col for col in parsed.columns if col not in available_column_set]
+                return {
+                    "valid": False,
+                    "error": f"Columns {invalid_columns} do not exist in table '{table_name}'",
+                    "available_columns": available_columns
+                }
+            
+            return {"valid": True, "error": None, "available_columns": available_columns}
             
         except Exception as e:
-            print(f"❌ Error validating SQL against schema: {e}")
+            logger.error("❌ Error validating SQL against schema: %s", e)
             return {"valid": True, "error": None}  # If validation fails, allow execution
     
-    def _generate_response(self, state: ConversationState) -> ConversationState:
+    async def _generate_response(self, state: ConversationState) -> ConversationState:
         """
         Generate final response using LLM with all context.
         
@@ -838,7 +1351,7 @@ Return format: ["table1", "table2"] or []
         Returns:
             Updated state with final response
         """
-        print("<=== _generate_response ===>")
+        logger.debug("<=== _generate_response ===>")
         messages = state["messages"]
         last_message = messages[-1].content if messages else ""
         
@@ -849,73 +1362,114 @@ Return format: ["table1", "table2"] or []
         if state.get("approval_pending") and state.get("context", {}).get("requires_approval"):
             # Return the approval message directly without LLM processing
             approval_message = state["context"]["operation_result"]
-            print(f"🔧 Returning approval message: {approval_message[:100]}...")
-            state["messages"].append(AIMessage(content=approval_message))
+            logger.debug("🔧 Returning approval message: %s...", approval_message[:100])
+            state["messages"].append(AIMessage(content=approval_message, additional_kwargs={"ts": time.time()}))
+            return state
+        
+        # Results the operation node marked as final are sent as they are
+        if (state.get("context") or {}).get("skip_llm"):
+            state["messages"].append(AIMessage(content=state["context"]["operation_result"], additional_kwargs={"ts": time.time()}))
             return state
         
         # Build comprehensive context
         context_parts = []
+        context = state.get("context") or {}
         
-        if state.get("context"):
-            if "operation_result" in state["context"]:
-                context_parts.append(f"Database Operation Result: {state['context']['operation_result']}")
-            if "database_info" in state["context"]:
-                context_parts.append(f"Database Summary: {json.dumps(state['context']['database_info'], indent=2)}")
+        if "operation_result" in context:
+            context_parts.append(DB_OP_PREFIX + context["operation_result"])
+        if "database_info" in context:
+            context_parts.append(DB_INFO_PREFIX + self._get_schema_summary(context["database_info"]))
         
         # Add human approval context if relevant
-        if state.get("human_approval") is not None:
-            if state["human_approval"]:
-                context_parts.append("Human approved the database operation.")
-            else:
-                context_parts.append("Human denied the database operation.")
+        human_approval = state.get("human_approval")
+        if human_approval is not None:
+            context_parts.append(APPROVAL_CONTEXT[bool(human_approval)])
         
         # LangGraph automatically manages conversation history through the state
         
-        full_context = "\n\n".join(context_parts) if context_parts else "No additional context available."
+        full_context = "\n\n".join(context_parts) if context_parts else NO_CONTEXT
         
         response_prompt = get_response_prompt(full_context, last_message)
         
         try:
-            # LangGraph automatically provides conversation history through state["messages"]
-            # We can use the existing messages in the state which include the full conversation
-            existing_messages = state["messages"]
+            # LangGraph automatically provides conversation history through state["messages"];
+            # long histories are compacted so the prompt stays bounded
+            existing_messages = await self._compact_history(state["messages"])
             
             # Create a new message list with system prompt and existing conversation
-            llm_messages = [SystemMessage(content=self.system_prompt)]
-            llm_messages.extend(existing_messages)
-            llm_messages.append(HumanMessage(content=response_prompt))
+            llm_messages = [self._system_message, *existing_messages, HumanMessage(content=response_prompt)]
             
-            response = self.llm.invoke(llm_messages)
+            response = await self._response_batcher.submit(llm_messages)
             
             ai_response = response.content
             
             # Add AI response to state
-            state["messages"].append(AIMessage(content=ai_response))
+            state["messages"].append(AIMessage(content=ai_response, additional_kwargs={"ts": time.time()}))
             
         except Exception as e:
-            print(f"❌ LLM Response Generation Error: {str(e)}")
+            logger.error("❌ LLM Response Generation Error: %s", e)
             if "401" in str(e) or "User not found" in str(e):
-                print("🔑 API Authentication Error: Please check your OpenRouter API key")
-                print("   - Make sure OPENROUTER_API_KEY06 is set correctly in .env file")
-                print("   - Verify the API key is valid and has sufficient credits")
+                logger.error("🔑 API Authentication Error: Please check your OpenRouter API key")
+                logger.error("   - Make sure OPENROUTER_API_KEY06 is set correctly in .env file")
+                logger.error("   - Verify the API key is valid and has sufficient credits")
                 error_response = f"❌ **API Authentication Error:** {str(e)}\n\nPlease check your OpenRouter API key configuration."
             else:
                 error_response = f"Error generating response: {str(e)}"
-            state["messages"].append(AIMessage(content=error_response))
+            state["messages"].append(AIMessage(content=error_response, additional_kwargs={"ts": time.time()}))
         
         return state
     
     
+    async def _compact_history(self, messages: List[Any]) -> List[Any]:
+        """
+        Replace all but the most recent messages with a summary once a thread gets long.
+        
+        The summary takes the id of the oldest message and the other old messages are
+        turned into RemoveMessage markers, so the add_messages reducer persists the
+        compacted history in place. Earlier summaries are folded into the new one.
+        
+        Args:
+            messages: state["messages"] of the running turn, updated in place
+            
+        Returns:
+            Messages to send to the LLM
+        """
+        if len(messages) <= AgentConfig.HISTORY_MAX_MESSAGES:
+            return messages
+        
+        split = len(messages) - AgentConfig.HISTORY_KEEP_MESSAGES
+        old, recent = messages[:split], messages[split:]
+        roles = {HumanMessage: "User", AIMessage: "Assistant", SystemMessage: "Earlier"}
+        conversation = "\n".join(f"{roles.get(type(msg), 'Note')}: {msg.content}" for msg in old)
+        
+        try:
+            response = await self._response_batcher.submit([HumanMessage(content=get_summary_prompt(conversation))])
+        except Exception as e:
+            logger.warning("⚠️ Could not summarize conversation history: %s", e)
+            return messages
+        
+        summary = SystemMessage(content=SUMMARY_PREFIX + response.content, id=old[0].id)
+        messages[:] = [summary, *(RemoveMessage(id=msg.id) for msg in old[1:]), *recent]
+        return [summary, *recent]
+    
     def get_database_info(self) -> Dict[str, Any]:
         """
         Get lightweight database information - only table names and column headers.
         
+        The result is cached for AgentConfig.DATABASE_INFO_TTL seconds and shared
+        between callers, so treat it as read-only.
+        
         Returns:
             Dictionary containing basic database structure information
         """
+        now = time.monotonic()
+        cached = self._database_info_cache
+        if cached is not None and now - cached[0] < AgentConfig.DATABASE_INFO_TTL:
+            return cached[1]
+        
         try:
-            print("<=== get_database_info ===>")
-            inspector = inspect(self.engine)
+            logger.debug("<=== get_database_info ===>")
+            inspector = get_inspector(self.engine)
             tables = inspector.get_table_names()
             
             database_info = {
@@ -938,90 +1492,64 @@ Return format: ["table1", "table2"] or []
                     ]
                 }
             
+            self._database_info_cache = (now, database_info)
             return database_info
             
         except Exception as e:
             return {"error": f"Failed to get database info: {str(e)}"}
     
     
-    def execute_sql_query(self, query: str) -> Dict[str, Any]:
+    async def aget_database_info(self) -> Dict[str, Any]:
+        """Async get_database_info; a cache miss is inspected in a worker thread."""
+        cached = self._database_info_cache
+        if cached is not None and time.monotonic() - cached[0] < AgentConfig.DATABASE_INFO_TTL:
+            return cached[1]
+        return await asyncio.to_thread(self.get_database_info)
+    
+    async def aexecute_sql_query(self, query: str, parsed_sql: Optional[ParsedSQL] = None) -> Dict[str, Any]:
+        """
+        Async execute_sql_query for the chat path and async API handlers.
+        
+        The blocking driver call runs in a worker thread on the pooled engine, so
+        concurrent turns do not stall the event loop while the database works.
+        
+        Args:
+            query: SQL query to execute
+            parsed_sql: Result of _parse_sql(query) if the caller already has it
+            
+        Returns:
+            Dictionary containing query results or error information
+        """
+        return await asyncio.to_thread(self.execute_sql_query, query, parsed_sql)
+    
+    def execute_sql_query(self, query: str, parsed_sql: Optional[ParsedSQL] = None) -> Dict[str, Any]:
         """
         Execute a SQL query with real-time execution.
         
         Args:
             query: SQL query to execute
+            parsed_sql: Result of _parse_sql(query) if the caller already has it
             
         Returns:
             Dictionary containing query results or error information
         """
         try:
-            print(f"<=== execute_sql_query ===> Executing: {query}")
-            query_upper = query.upper().strip()
-            
-            # Use engine.begin() for proper transaction management
-            with self.engine.begin() as conn:
-                if query_upper.startswith('SELECT'):
-                    # For SELECT queries, fetch and return data
-                    result = conn.execute(text(query))
-                    columns = result.keys()
-                    rows = result.fetchall()
-                    
-                    return {
-                        "success": True,
-                        "columns": list(columns),
-                        "data": [dict(row._mapping) for row in rows],
-                        "row_count": len(rows),
-                        "query_type": "SELECT"
-                    }
-                else:
-                    # For other operations (INSERT, UPDATE, DELETE, ALTER, DROP, CREATE)
-                    result = conn.execute(text(query))
-                    # Transaction will be automatically committed when exiting the context
-                    
-                    # For CREATE TABLE operations, verify the table was actually created
-                    if query_upper.startswith('CREATE'):
-                        table_name = self.db_tools.extract_table_name_from_create(query)
-                        if table_name:
-                            # Verify table creation within the same transaction
-                            verification_query = self.db_tools.get_table_exists_query(table_name)
-                            verification_result = conn.execute(text(verification_query))
-                            verification_row = verification_result.fetchone()
-                            table_exists = bool(verification_row[0]) if verification_row else False
-                            
-                            if not table_exists:
-                                return {
-                                    "success": False,
-                                    "error": f"Table '{table_name}' creation failed - table not found in database",
-                                    "query_type": "CREATE"
-                                }
-                    
-                    # For DROP TABLE operations, verify the table was actually dropped
-                    elif query_upper.startswith('DROP'):
-                        table_name = self.db_tools.extract_table_name_from_drop(query)
-                        if table_name:
-                            # Verify table deletion within the same transaction
-                            verification_query = self.db_tools.get_table_exists_query(table_name)
-                            verification_result = conn.execute(text(verification_query))
-                            verification_row = verification_result.fetchone()
-                            table_still_exists = bool(verification_row[0]) if verification_row else False
-                            
-                            if table_still_exists:
-                                return {
-                                    "success": False,
-                                    "error": f"Table '{table_name}' deletion failed - table still exists in database",
-                                    "query_type": "DROP"
-                                }
-                    
-                    return {
-                        "success": True,
-                        "message": "Query executed successfully",
-                        "affected_rows": result.rowcount if hasattr(result, 'rowcount') else 0,
-                        "query_type": query_upper.split()[0] if query_upper.split() else "UNKNOWN"
-                    }
-                        
+            logger.debug("<=== execute_sql_query ===> Executing: %s", query)
+            parsed = parsed_sql or _parse_sql(query)
+            handler = self._EXECUTE_HANDLERS.get(parsed.verb, DatabaseAgent._execute_write)
+            
+            # Pooled session; session.begin() commits on success and rolls back on error
+            with self.SessionLocal() as session, session.begin():
+                result = handler(self, session.connection(), query, parsed)
+            # Only after commit, so a concurrent schema read cannot re-cache the old catalog
+            self._invalidate_schema_cache(parsed)
+            return result
+        
+        except DDLVerificationError as e:
+            return {"success": False, "error": str(e), "query": query, "query_type": parsed.verb}
         except SQLAlchemyError as e:
             error_msg = str(e)
-            print(f"SQLAlchemy Error: {error_msg}")
+            logger.error("SQLAlchemy Error: %s", error_msg)
             # Provide more specific error messages
             if "syntax error" in error_msg.lower():
                 return {
@@ -1053,7 +1581,7 @@ Return format: ["table1", "table2"] or []
                 }
         except Exception as e:
             error_msg = str(e)
-            print(f"Unexpected Error: {error_msg}")
+            logger.error("Unexpected Error: %s", error_msg)
             return {
                 "success": False,
                 "error": f"Unexpected error: {error_msg}",
@@ -1061,6 +1589,99 @@ Return format: ["table1", "table2"] or []
                 "error_type": "unexpected_error"
             }
     
+    def _execute_select(self, conn, query: str, parsed: ParsedSQL) -> Dict[str, Any]:
+        """
+        Run a SELECT query and return up to AgentConfig.MAX_RESULT_ROWS rows.
+        
+        Rows are read through a server-side cursor where the driver supports one,
+        so rows past the cap are never transferred or held in memory.
+        Rows are returned column-first: "columns" holds the names once and each
+        entry of "data" is a list of values in that order.
+        """
+        result = conn.execution_options(
+            stream_results=True, yield_per=AgentConfig.RESULT_FETCH_SIZE
+        ).execute(sql_text(query))
+        columns = result.keys()
+        rows = result.fetchmany(AgentConfig.MAX_RESULT_ROWS + 1)
+        result.close()
+        
+        truncated = len(rows) > AgentConfig.MAX_RESULT_ROWS
+        if truncated:
+            del rows[AgentConfig.MAX_RESULT_ROWS:]
+        
+        return {
+            "success": True,
+            "columns": list(columns),
+            "data": [list(row) for row in rows],
+            "row_count": len(rows),
+            "truncated": truncated,
+            "query_type": parsed.verb
+        }
+    
+    def _execute_write(self, conn, query: str, parsed: ParsedSQL) -> Dict[str, Any]:
+        """Run any other statement (INSERT, UPDATE, DELETE, ALTER, DROP, CREATE, ...)."""
+        result = conn.execute(sql_text(query))
+        # Transaction will be automatically committed when the session block exits
+        
+        # A failed CREATE/DROP already raises; the catalog re-check is an opt-in extra round trip
+        if AgentConfig.VERIFY_DDL:
+            verification_error = self._verify_table_ddl(conn, parsed)
+            if verification_error:
+                raise DDLVerificationError(verification_error)
+        
+        return {
+            "success": True,
+            "message": "Query executed successfully",
+            "affected_rows": result.rowcount if hasattr(result, 'rowcount') else 0,
+            "query_type": parsed.verb or "UNKNOWN"
+        }
+    
+    def _verify_table_ddl(self, conn, parsed: ParsedSQL) -> Optional[str]:
+        """
+        Check within the same transaction that a CREATE or DROP TABLE took effect.
+        
+        Args:
+            conn: Connection of the running transaction
+            parsed: Parsed form of the executed SQL statement
+            
+        Returns:
+            Error message if the table is not in the expected state, otherwise None
+        """
+        table_name = parsed.table
+        if not table_name or parsed.verb not in ("CREATE", "DROP"):
+            return None
+        should_exist = parsed.verb == "CREATE"
+        
+        verification_row = conn.execute(*self.db_tools.get_table_exists_query(table_name)).fetchone()
+        table_exists = bool(verification_row[0]) if verification_row else False
+        
+        if table_exists == should_exist:
+            return None
+        if should_exist:
+            return f"Table '{table_name}' creation failed - table not found in database"
+        return f"Table '{table_name}' deletion failed - table still exists in database"
+    
+    # Statement runners by leading keyword; anything not listed runs as a write
+    _EXECUTE_HANDLERS = {"SELECT": _execute_select}
+    
+    def _run_write(self, statement, params=None):
+        """
+        Execute one write statement in its own transaction.
+        
+        engine.begin() commits when the block exits and rolls back if it raises.
+        
+        Args:
+            statement: SQL string or prepared TextClause
+            params: Bind parameters, or a list of them for executemany
+            
+        Returns:
+            SQLAlchemy CursorResult of the statement
+        """
+        if isinstance(statement, str):
+            statement = sql_text(statement)
+        with self.engine.begin() as conn:
+            return conn.execute(statement, params)
+    
     def create_table(self, table_name: str, columns: List[Dict[str, str]]) -> Dict[str, Any]:
         """
         Create a new table with specified columns.
@@ -1073,7 +1694,7 @@ Return format: ["table1", "table2"] or []
             Dictionary containing operation result
         """
         try:
-            print("<=== create_table ===>")
+            logger.debug("<=== create_table ===>")
             column_definitions = []
             for col in columns:
                 col_def = f"{col['name']} {col['type']}"
@@ -1087,9 +1708,8 @@ Return format: ["table1", "table2"] or []
             
             query = f"CREATE TABLE {table_name} ({', '.join(column_definitions)})"
             
-            with self.engine.connect() as conn:
-                conn.execute(text(query))
-                conn.commit()
+            self._run_write(query)
+            self._invalidate_schema_cache(_parse_sql(query))
                 
             return {
                 "success": True,
@@ -1114,12 +1734,11 @@ Return format: ["table1", "table2"] or []
             Dictionary containing operation result
         """
         try:
-            print("<=== drop_table ===>")
+            logger.debug("<=== drop_table ===>")
             query = f"DROP TABLE IF EXISTS {table_name}"
             
-            with self.engine.connect() as conn:
-                conn.execute(text(query))
-                conn.commit()
+            self._run_write(query)
+            self._invalidate_schema_cache(_parse_sql(query))
                 
             return {
                 "success": True,
@@ -1144,15 +1763,10 @@ Return format: ["table1", "table2"] or []
             Dictionary containing operation result
         """
         try:
-            print("<=== insert_data ===>")
-            columns = list(data.keys())
-            placeholders = ', '.join([':' + col for col in columns])
-            
-            query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+            logger.debug("<=== insert_data ===>")
+            statement = _insert_statement(table_name, tuple(sorted(data)))
             
-            with self.engine.connect() as conn:
-                conn.execute(text(query), data)
-                conn.commit()
+            self._run_write(statement, data)
                 
             return {
                 "success": True,
@@ -1165,6 +1779,43 @@ Return format: ["table1", "table2"] or []
                 "error": f"Failed to insert data: {str(e)}"
             }
     
+    def insert_many(self, table_name: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Insert several rows into a table with one executemany call.
+        
+        Args:
+            table_name: Name of the table
+            rows: Dictionaries of column names and values; all must have the same columns
+            
+        Returns:
+            Dictionary containing operation result
+        """
+        try:
+            logger.debug("<=== insert_many ===>")
+            if not rows:
+                return {"success": True, "message": "No rows to insert", "affected_rows": 0}
+            
+            columns = tuple(sorted(rows[0]))
+            if any(len(row) != len(columns) or not row.keys() >= set(columns) for row in rows):
+                return {
+                    "success": False,
+                    "error": "Failed to insert data: all rows must have the same columns"
+                }
+            
+            self._run_write(_insert_statement(table_name, columns), rows)
+                
+            return {
+                "success": True,
+                "message": f"{len(rows)} rows inserted into '{table_name}' successfully",
+                "affected_rows": len(rows)
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to insert data: {str(e)}"
+            }
+    
     def update_data(self, table_name: str, data: Dict[str, Any], where_clause: str) -> Dict[str, Any]:
         """
         Update data in a table.
@@ -1178,13 +1829,10 @@ Return format: ["table1", "table2"] or []
             Dictionary containing operation result
         """
         try:
-            print("<=== update_data ===>")
-            set_clauses = ', '.join([f"{col} = :{col}" for col in data.keys()])
-            query = f"UPDATE {table_name} SET {set_clauses} WHERE {where_clause}"
+            logger.debug("<=== update_data ===>")
+            statement = _update_statement(table_name, tuple(sorted(data)), where_clause)
             
-            with self.engine.connect() as conn:
-                result = conn.execute(text(query), data)
-                conn.commit()
+            result = self._run_write(statement, data)
                 
             return {
                 "success": True,
@@ -1210,12 +1858,10 @@ Return format: ["table1", "table2"] or []
             Dictionary containing operation result
         """
         try:
-            print("<=== delete_data ===>")
+            logger.debug("<=== delete_data ===>")
             query = f"DELETE FROM {table_name} WHERE {where_clause}"
             
-            with self.engine.connect() as conn:
-                result = conn.execute(text(query))
-                conn.commit()
+            result = self._run_write(query)
                 
             return {
                 "success": True,
@@ -1230,9 +1876,90 @@ Return format: ["table1", "table2"] or []
             }
     
     def chat(self, user_input: str, thread_id: str = None) -> str:
+        """
+        Blocking chat interface for scripts and the CLI; see handle.
+        
+        Args:
+            user_input: User's message or query
+            thread_id: Thread ID for conversation history (creates new if None)
+            
+        Returns:
+            Agent's response
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.handle(user_input, thread_id))
+
+    async def aclose(self) -> None:
+        """Close the agent's async HTTP client; call from the loop that used it."""
+        await self._http_async_client.aclose()
+
+    def close(self) -> None:
+        """Blocking counterpart of aclose that also closes the chat() event loop."""
+        if self._loop is None or self._loop.is_closed():
+            asyncio.run(self.aclose())
+            return
+        self._loop.run_until_complete(self.aclose())
+        self._loop.close()
+
+    async def handle(self, user_input: str, thread_id: str = None) -> str:
+        """
+        Answer a turn, skipping the workflow for obvious small talk.
+        
+        Greetings and thanks get a direct small-model reply that is appended to the
+        thread in a single checkpoint write; every other turn runs through achat.
+        
+        Args:
+            user_input: User's message or query
+            thread_id: Thread ID for conversation history (creates new if None)
+            
+        Returns:
+            Agent's response
+        """
+        if not self._is_small_talk(WORD_RE.findall(user_input.lower())):
+            return await self.achat(user_input, thread_id)
+        
+        logger.debug("<=== handle: small talk ===>")
+        if thread_id is None:
+            thread_id = str(uuid.uuid4())
+            logger.debug("Created new thread: %s", thread_id)
+        
+        try:
+            sent_at = time.time()
+            # Long threads are compacted here too, so this path sends a bounded history
+            history = list(self._get_thread_values(thread_id).get("messages", []))
+            sent_history = await self._compact_history(history)
+            # The summary and RemoveMessage markers left in history persist the compaction
+            compaction = history[:len(history) - len(sent_history) + 1] if sent_history is not history else []
+            
+            llm_messages = [self._system_message, *sent_history]
+            # Untimestamped copy for the LLM so a first-turn greeting can hit the LLM cache
+            llm_messages.append(HumanMessage(content=user_input))
+            llm_messages.append(HumanMessage(content=get_response_prompt(NO_CONTEXT, user_input)))
+            
+            response = await self._response_batcher.submit(llm_messages)
+            
+            await self.workflow.aupdate_state(
+                {"configurable": {"thread_id": thread_id}},
+                {"messages": [
+                    *compaction,
+                    HumanMessage(content=user_input, additional_kwargs={"ts": sent_at}),
+                    AIMessage(content=response.content, additional_kwargs={"ts": time.time()})
+                ]},
+                as_node="response"
+            )
+            return response.content
+        except Exception as e:
+            logger.error("Error in handle: %s", e)
+            return f"❌ Error: {str(e)}"
+    
+    async def achat(self, user_input: str, thread_id: str = None) -> str:
         """
         Main chat interface using LLM-driven workflow with LangGraph thread management.
         
+        Runs the workflow on the event loop so concurrent sessions overlap their
+        LLM and database I/O.
+        
         Args:
             user_input: User's message or query
             thread_id: Thread ID for conversation history (creates new if None)
@@ -1241,42 +1968,42 @@ Return format: ["table1", "table2"] or []
             Agent's response
         """
         try:
-            print("<=== chat ===>")
-            print(f"User input: {user_input}")
+            logger.debug("<=== chat ===>")
+            logger.debug("User input: %s", user_input)
             
             # Generate new thread ID if not provided
             if thread_id is None:
                 thread_id = str(uuid.uuid4())
-                print(f"Created new thread: {thread_id}")
+                logger.debug("Created new thread: %s", thread_id)
             
             # Configure thread for LangGraph
             config = {"configurable": {"thread_id": thread_id}}
             
             # Check if this is an approval continuation message
             if user_input in ['__APPROVED__', '__DENIED__']:
-                print(f"🔧 Handling approval continuation: {user_input}")
+                logger.debug("🔧 Handling approval continuation: %s", user_input)
                 
                 # Get the current state to retrieve approval_id
-                current_state = self.workflow.get_state(config)
-                if current_state and current_state.values:
-                    approval_id = current_state.values.get("approval_id")
-                    print(f"🔧 Found approval_id: {approval_id}")
+                thread_values = self._get_thread_values(thread_id)
+                if thread_values:
+                    approval_id = thread_values.get("approval_id")
+                    logger.debug("🔧 Found approval_id: %s", approval_id)
                     
                     if approval_id:
                         # Check approval status
                         approval_status = simple_approval_manager.get_approval_status(approval_id)
                         status = approval_status.get("status", "").lower()
-                        print(f"🔧 Approval status: {status}")
+                        logger.debug("🔧 Approval status: %s", status)
                         
                         if status == "approved":
                             # Execute the approved query
-                            sql_query = current_state.values.get("context", {}).get("sql_executed")
+                            sql_query = (thread_values.get("context") or {}).get("sql_executed")
                             if sql_query:
-                                print(f"🔧 Executing approved query: {sql_query}")
-                                result = self.execute_sql_query(sql_query)
+                                logger.debug("🔧 Executing approved query: %s", sql_query)
+                                result = await self.aexecute_sql_query(sql_query)
                                 
                                 if result.get("success"):
-                                    return f"✅ Successfully executed approved operation:\n```sql\n{sql_query}\n```\n\nResult: {json.dumps(result, indent=2)}"
+                                    return f"✅ Successfully executed approved operation:\n```sql\n{sql_query}\n```\n\nResult: {json.dumps(result, separators=(',', ':'), default=str)}"
                                 else:
                                     return f"❌ Error executing approved operation:\n```sql\n{sql_query}\n```\n\nError: {result.get('error', 'Unknown error')}"
                         elif status == "denied":
@@ -1286,17 +2013,19 @@ Return format: ["table1", "table2"] or []
             
             # Create initial state
             initial_state = ConversationState(
-                messages=[HumanMessage(content=user_input)],
+                messages=[HumanMessage(content=user_input, additional_kwargs={"ts": time.time()})],
                 next_action=None,
                 context=None,
                 pending_query=None,
                 human_approval=None,
                 approval_pending=None,
-                approval_id=None
+                approval_id=None,
+                intent=None,
+                tables=None
             )
             
             # Run through the workflow with thread configuration
-            final_state = self.workflow.invoke(initial_state, config=config)
+            final_state = await self.workflow.ainvoke(initial_state, config=config)
             
             # Get the last AI message
             ai_messages = [msg for msg in final_state["messages"] if isinstance(msg, AIMessage)]
@@ -1309,11 +2038,27 @@ Return format: ["table1", "table2"] or []
                 
         except Exception as e:
             error_response = f"❌ Error: {str(e)}"
-            print(f"Error in chat: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in achat: %s", e)
             return error_response
     
+    def _get_thread_values(self, thread_id: str) -> Dict[str, Any]:
+        """
+        Read a thread's latest state values straight from the checkpointer.
+        
+        Cheaper than workflow.get_state, which also rebuilds the pending task
+        snapshot that nothing here reads.
+        
+        Args:
+            thread_id: Thread ID to read
+            
+        Returns:
+            The thread's channel values, or an empty dict for an unknown thread
+        """
+        checkpoint_tuple = self.memory.get_tuple({"configurable": {"thread_id": thread_id}})
+        if checkpoint_tuple is None:
+            return {}
+        return checkpoint_tuple.checkpoint["channel_values"]
+    
     def get_conversation_history(self, thread_id: str = None) -> List[Dict[str, Any]]:
         """
         Get the conversation history for a specific thread using LangGraph's memory.
@@ -1324,35 +2069,36 @@ Return format: ["table1", "table2"] or []
         Returns:
             List of conversation entries with role, content, and timestamp
         """
-        print("<=== get_conversation_history ===>")
+        logger.debug("<=== get_conversation_history ===>")
         if not thread_id:
             return []
         
         try:
             # Get the current state for the thread
-            config = {"configurable": {"thread_id": thread_id}}
-            state = self.workflow.get_state(config)
+            thread_values = self._get_thread_values(thread_id)
             
-            if state and state.values:
-                messages = state.values.get("messages", [])
+            if thread_values:
+                messages = thread_values.get("messages", [])
+                # Messages record when they were added; older ones without a timestamp get "now"
+                now_iso = datetime.now().isoformat()
                 history = []
                 for msg in messages:
                     if isinstance(msg, HumanMessage):
-                        history.append({
-                            "role": "user",
-                            "content": msg.content,
-                            "timestamp": datetime.now().isoformat()
-                        })
+                        role = "user"
                     elif isinstance(msg, AIMessage):
-                        history.append({
-                            "role": "assistant", 
-                            "content": msg.content,
-                            "timestamp": datetime.now().isoformat()
-                        })
+                        role = "assistant"
+                    else:
+                        continue
+                    ts = msg.additional_kwargs.get("ts")
+                    history.append({
+                        "role": role,
+                        "content": msg.content,
+                        "timestamp": datetime.fromtimestamp(ts).isoformat() if ts else now_iso
+                    })
                 return history
             return []
         except Exception as e:
-            print(f"Error getting conversation history: {e}")
+            logger.error("Error getting conversation history: %s", e)
             return []
     
     def clear_conversation_history(self, thread_id: str = None) -> None:
@@ -1362,7 +2108,7 @@ Return format: ["table1", "table2"] or []
         Args:
             thread_id: Thread ID to clear
         """
-        print("<=== clear_conversation_history ===>")
+        logger.debug("<=== clear_conversation_history ===>")
         if thread_id:
             try:
                 # Clear the thread by updating it with empty state
@@ -1374,7 +2120,7 @@ Return format: ["table1", "table2"] or []
                 )
                 self.workflow.update_state(config, empty_state)
             except Exception as e:
-                print(f"Error clearing conversation history: {e}")
+                logger.error("Error clearing conversation history: %s", e)
     
     def create_new_thread(self) -> str:
         """
@@ -1384,7 +2130,7 @@ Return format: ["table1", "table2"] or []
             New thread ID
         """
         thread_id = str(uuid.uuid4())
-        print(f"Created new thread: {thread_id}")
+        logger.debug("Created new thread: %s", thread_id)
         return thread_id
     
     def get_thread_info(self, thread_id: str) -> Dict[str, Any]:
@@ -1398,11 +2144,10 @@ Return format: ["table1", "table2"] or []
             Thread information dictionary
         """
         try:
-            config = {"configurable": {"thread_id": thread_id}}
-            state = self.workflow.get_state(config)
+            thread_values = self._get_thread_values(thread_id)
             
-            if state and state.values:
-                messages = state.values.get("messages", [])
+            if thread_values:
+                messages = thread_values.get("messages", [])
                 return {
                     "thread_id": thread_id,
                     "message_count": len(messages),
@@ -1436,7 +2181,7 @@ Return format: ["table1", "table2"] or []
         Returns:
             Formatted help text with available commands and examples
         """
-        print("<=== get_help ===>")
+        logger.debug("<=== get_help ===>")
         return HELP_TEXT
 
 
@@ -5,12 +5,103 @@ This module provides a streamlined approach to human approval for dangerous
 database operations with minimal overhead and maximum performance.
 """
 
-import uuid
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+import functools
+import secrets
+import sys
+import heapq
+import itertools
+import time
+from typing import Dict, Any, Iterator, Optional, List, Tuple
+from datetime import datetime, timezone
 from enum import Enum
+from dataclasses import dataclass
 import re
 
+# Prefer RE2 (google-re2) when installed: its linear-time DFA matching has no
+# backtracking blowup on the .* in MASS_UPDATE_RE. The standard re module is the fallback.
+try:
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
+__all__ = [
+    "SAFE_VERBS",
+    "DANGEROUS_VERBS",
+    "MASS_UPDATE_RE",
+    "TABLE_RE_BY_OPERATION",
+    "is_dangerous_sql",
+    "ApprovalStatus",
+    "ApprovalRecord",
+    "SimpleApprovalManager",
+    "simple_approval_manager"
+]
+
+
+# Leading keywords that decide approval on their own; these and the patterns
+# below are public so the agent's router reuses them instead of compiling its own
+SAFE_VERBS = frozenset({'SELECT', 'INSERT', 'CREATE', 'SHOW', 'DESCRIBE'})
+DANGEROUS_VERBS = frozenset({'DROP', 'DELETE', 'ALTER', 'TRUNCATE'})
+
+# An UPDATE is dangerous only as a mass update (UPDATE ... SET ... WHERE 1=1)
+MASS_UPDATE_RE = _re_engine.compile(r'(?i)UPDATE\s+.*\s+SET\s+.*\s+WHERE\s+1\s*=\s*1')
+
+# Target table per operation type reported by get_operation_info; anything else is UNKNOWN
+TABLE_RE_BY_OPERATION = {
+    operation: _re_engine.compile('(?i)' + pattern)
+    for operation, pattern in (
+        ('DROP', r'\s*DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?(\w+)'),
+        ('DELETE', r'\s*DELETE\s+FROM\s+(\w+)'),
+        ('ALTER', r'\s*ALTER\s+TABLE\s+(\w+)'),
+        ('TRUNCATE', r'\s*TRUNCATE\s+TABLE\s+(\w+)'),
+        ('UPDATE', r'\s*UPDATE\s+(\w+)'),
+    )
+}
+
+# No SQL keyword we classify is longer than this
+_MAX_KEYWORD_LENGTH = 16
+
+
+def _leading_keyword(sql_query: str) -> str:
+    """
+    Get the uppercased first word of a SQL query.
+    
+    Only the leading keyword is scanned and copied, so the cost does not
+    grow with the length of the query.
+    
+    Args:
+        sql_query: SQL query to inspect
+        
+    Returns:
+        Leading keyword, or an empty string if the query has none
+    """
+    s = sql_query.lstrip()
+    end = 0
+    while end < len(s) and end < _MAX_KEYWORD_LENGTH and s[end].isalpha():
+        end += 1
+    return s[:end].upper()
+
+
+@functools.lru_cache(maxsize=512)
+def is_dangerous_sql(sql_query: str) -> bool:
+    """
+    Decide whether a SQL query is dangerous, memoized per query string.
+    
+    Args:
+        sql_query: SQL query to check
+        
+    Returns:
+        True if the operation is dangerous and requires approval
+    """
+    # The leading keyword decides; only UPDATE needs a regex
+    verb = _leading_keyword(sql_query)
+    if verb in SAFE_VERBS:
+        return False
+    if verb in DANGEROUS_VERBS:
+        return True
+    if verb == 'UPDATE':
+        return MASS_UPDATE_RE.match(sql_query.lstrip()) is not None
+    return False
+
 
 class ApprovalStatus(Enum):
     """Approval status enumeration"""
@@ -20,6 +111,57 @@ class ApprovalStatus(Enum):
     EXPIRED = "expired"
 
 
+# Interned status strings, so the many records holding one status share a single object
+_PENDING = sys.intern(ApprovalStatus.PENDING.value)
+_APPROVED = sys.intern(ApprovalStatus.APPROVED.value)
+_DENIED = sys.intern(ApprovalStatus.DENIED.value)
+_EXPIRED = sys.intern(ApprovalStatus.EXPIRED.value)
+
+
+@dataclass(slots=True)
+class ApprovalRecord:
+    """A single approval request; timestamps are seconds since the epoch."""
+    id: str
+    sql_query: str
+    operation_type: str
+    table_name: Optional[str]
+    description: str
+    status: str
+    created_epoch: float
+    expires_epoch: float
+    approved_epoch: Optional[float] = None
+    denied_epoch: Optional[float] = None
+    approved_by: Optional[str] = None
+    denied_by: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the record for API responses.
+        
+        Returns:
+            Dictionary with timestamps formatted as ISO strings
+        """
+        return {
+            "id": self.id,
+            "sql_query": self.sql_query,
+            "operation_type": self.operation_type,
+            "table_name": self.table_name,
+            "description": self.description,
+            "status": self.status,
+            "created_at": _isoformat(self.created_epoch),
+            "expires_at": _isoformat(self.expires_epoch),
+            "approved_at": _isoformat(self.approved_epoch),
+            "denied_at": _isoformat(self.denied_epoch),
+            "approved_by": self.approved_by,
+            "denied_by": self.denied_by
+        }
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    """Format an epoch timestamp as a UTC ISO string, passing None through."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat() if timestamp is not None else None
+
+
 class SimpleApprovalManager:
     """
     Simple and performant human approval manager for dangerous database operations.
@@ -38,30 +180,18 @@ class SimpleApprovalManager:
         Args:
             timeout_minutes: Approval timeout in minutes (default: 5)
         """
-        self.pending_approvals: Dict[str, Dict[str, Any]] = {}
+        self.pending_approvals: Dict[str, ApprovalRecord] = {}
         self.timeout_seconds = timeout_minutes * 60
         
-        # Pre-compiled regex patterns for fast detection
-        self.dangerous_patterns = [
-            re.compile(r'^\s*DROP\s+', re.IGNORECASE),
-            re.compile(r'^\s*DELETE\s+FROM\s+', re.IGNORECASE),
-            re.compile(r'^\s*ALTER\s+TABLE\s+', re.IGNORECASE),
-            re.compile(r'^\s*TRUNCATE\s+TABLE\s+', re.IGNORECASE),
-            re.compile(r'^\s*UPDATE\s+.*\s+SET\s+.*\s+WHERE\s+1\s*=\s*1', re.IGNORECASE),  # Mass updates
-        ]
-        
-        # Safe operations that don't need approval
-        self.safe_patterns = [
-            re.compile(r'^\s*SELECT\s+', re.IGNORECASE),
-            re.compile(r'^\s*INSERT\s+INTO\s+', re.IGNORECASE),
-            re.compile(r'^\s*CREATE\s+TABLE\s+', re.IGNORECASE),
-            re.compile(r'^\s*SHOW\s+', re.IGNORECASE),
-            re.compile(r'^\s*DESCRIBE\s+', re.IGNORECASE),
-        ]
+        # IDs still awaiting a decision, in creation order; decided and expired IDs are removed
+        self._pending_ids: Dict[str, None] = {}
+        
+        # Min-heap of (expires_epoch, approval_id) so cleanup only touches expired entries
+        self._expiry_heap: List[Tuple[float, str]] = []
     
     def is_dangerous_operation(self, sql_query: str) -> bool:
         """
-        Fast detection of dangerous operations using pre-compiled regex patterns.
+        Fast detection of dangerous operations from the leading SQL keyword.
         
         Args:
             sql_query: SQL query to check
@@ -69,20 +199,7 @@ class SimpleApprovalManager:
         Returns:
             True if the operation is dangerous and requires approval
         """
-        if not sql_query or not sql_query.strip():
-            return False
-        
-        # Check safe patterns first (faster for common operations)
-        for pattern in self.safe_patterns:
-            if pattern.match(sql_query):
-                return False
-        
-        # Check dangerous patterns
-        for pattern in self.dangerous_patterns:
-            if pattern.match(sql_query):
-                return True
-        
-        return False
+        return is_dangerous_sql(sql_query)
     
     def get_operation_info(self, sql_query: str) -> Dict[str, Any]:
         """
@@ -94,24 +211,15 @@ class SimpleApprovalManager:
         Returns:
             Dictionary with operation details
         """
-        query_upper = sql_query.upper().strip()
-        
-        # Determine operation type
-        if query_upper.startswith('DROP'):
-            operation_type = 'DROP'
-        elif query_upper.startswith('DELETE'):
-            operation_type = 'DELETE'
-        elif query_upper.startswith('ALTER'):
-            operation_type = 'ALTER'
-        elif query_upper.startswith('TRUNCATE'):
-            operation_type = 'TRUNCATE'
-        elif query_upper.startswith('UPDATE'):
-            operation_type = 'UPDATE'
+        # The leading keyword gives the operation type and selects the one table regex to run
+        keyword = _leading_keyword(sql_query)
+        table_re = TABLE_RE_BY_OPERATION.get(keyword)
+        if table_re is None:
+            operation_type, table_name = 'UNKNOWN', None
         else:
-            operation_type = 'UNKNOWN'
-        
-        # Extract table name
-        table_name = self._extract_table_name(sql_query)
+            match = table_re.match(sql_query)
+            # Interned so every record of one type shares a single string
+            operation_type, table_name = sys.intern(keyword), match.group(1) if match else None
         
         # Generate description
         description = f"{operation_type} operation"
@@ -126,7 +234,10 @@ class SimpleApprovalManager:
     
     def _extract_table_name(self, sql_query: str) -> Optional[str]:
         """
-        Extract table name from SQL query using regex.
+        Extract table name from SQL query.
+        
+        Thin wrapper kept for existing callers; get_operation_info finds the
+        table in the same pass that determines the operation type.
         
         Args:
             sql_query: SQL query to analyze
@@ -134,20 +245,7 @@ class SimpleApprovalManager:
         Returns:
             Table name if found, None otherwise
         """
-        patterns = [
-            r'DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?(\w+)',
-            r'DELETE\s+FROM\s+(\w+)',
-            r'ALTER\s+TABLE\s+(\w+)',
-            r'TRUNCATE\s+TABLE\s+(\w+)',
-            r'UPDATE\s+(\w+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, sql_query, re.IGNORECASE)
-            if match:
-                return match.group(1)
-        
-        return None
+        return self.get_operation_info(sql_query)['table_name']
     
     def create_approval_request(self, sql_query: str) -> Dict[str, Any]:
         """
@@ -159,33 +257,32 @@ class SimpleApprovalManager:
         Returns:
             Dictionary containing approval request details
         """
-        approval_id = str(uuid.uuid4())
-        timestamp = datetime.now()
-        expires_at = timestamp + timedelta(seconds=self.timeout_seconds)
+        # 128 random bits as hex, without building and formatting a UUID object
+        approval_id = secrets.token_hex(16)
+        now = time.time()
         
         # Get operation info
         operation_info = self.get_operation_info(sql_query)
         
-        approval_request = {
-            "id": approval_id,
-            "sql_query": sql_query,
-            "operation_type": operation_info['operation_type'],
-            "table_name": operation_info['table_name'],
-            "description": operation_info['description'],
-            "status": ApprovalStatus.PENDING.value,
-            "created_at": timestamp.isoformat(),
-            "expires_at": expires_at.isoformat(),
-            "approved_at": None,
-            "denied_at": None,
-            "approved_by": None
-        }
-        
-        self.pending_approvals[approval_id] = approval_request
+        approval = ApprovalRecord(
+            id=approval_id,
+            sql_query=sql_query,
+            operation_type=operation_info['operation_type'],
+            table_name=operation_info['table_name'],
+            description=operation_info['description'],
+            status=_PENDING,
+            created_epoch=now,
+            expires_epoch=now + self.timeout_seconds
+        )
+        
+        self.pending_approvals[approval_id] = approval
+        self._pending_ids[approval_id] = None
+        heapq.heappush(self._expiry_heap, (approval.expires_epoch, approval_id))
         
         return {
             "approval_id": approval_id,
             "requires_approval": True,
-            "approval_request": approval_request
+            "approval_request": approval.to_dict()
         }
     
     def get_approval_status(self, approval_id: str) -> Dict[str, Any]:
@@ -208,19 +305,20 @@ class SimpleApprovalManager:
         
         # Check if approval has expired
         if self._is_expired(approval):
-            approval["status"] = ApprovalStatus.EXPIRED.value
+            approval.status = _EXPIRED
+            self._pending_ids.pop(approval_id, None)
             return {
                 "approval_id": approval_id,
-                "status": ApprovalStatus.EXPIRED.value,
+                "status": _EXPIRED,
                 "requires_approval": False,
                 "message": "Approval request has expired"
             }
         
         return {
             "approval_id": approval_id,
-            "status": approval["status"],
-            "requires_approval": approval["status"] == ApprovalStatus.PENDING.value,
-            "approval_request": approval
+            "status": approval.status,
+            "requires_approval": approval.status == _PENDING,
+            "approval_request": approval.to_dict()
         }
     
     def approve_operation(self, approval_id: str, approved_by: str = "user") -> Dict[str, Any]:
@@ -242,29 +340,31 @@ class SimpleApprovalManager:
         
         approval = self.pending_approvals[approval_id]
         
-        if approval["status"] != ApprovalStatus.PENDING.value:
+        if approval.status != _PENDING:
             return {
                 "success": False,
-                "error": f"Approval request is not pending (current status: {approval['status']})"
+                "error": f"Approval request is not pending (current status: {approval.status})"
             }
         
         if self._is_expired(approval):
-            approval["status"] = ApprovalStatus.EXPIRED.value
+            approval.status = _EXPIRED
+            self._pending_ids.pop(approval_id, None)
             return {
                 "success": False,
                 "error": "Approval request has expired"
             }
         
         # Update approval status
-        approval["status"] = ApprovalStatus.APPROVED.value
-        approval["approved_at"] = datetime.now().isoformat()
-        approval["approved_by"] = approved_by
+        approval.status = _APPROVED
+        self._pending_ids.pop(approval_id, None)
+        approval.approved_epoch = time.time()
+        approval.approved_by = approved_by
         
         return {
             "success": True,
             "approval_id": approval_id,
-            "status": ApprovalStatus.APPROVED.value,
-            "sql_query": approval["sql_query"],
+            "status": _APPROVED,
+            "sql_query": approval.sql_query,
             "message": "Operation approved successfully"
         }
     
@@ -287,24 +387,52 @@ class SimpleApprovalManager:
         
         approval = self.pending_approvals[approval_id]
         
-        if approval["status"] != ApprovalStatus.PENDING.value:
+        if approval.status != _PENDING:
             return {
                 "success": False,
-                "error": f"Approval request is not pending (current status: {approval['status']})"
+                "error": f"Approval request is not pending (current status: {approval.status})"
             }
         
         # Update approval status
-        approval["status"] = ApprovalStatus.DENIED.value
-        approval["denied_at"] = datetime.now().isoformat()
-        approval["approved_by"] = denied_by
+        approval.status = _DENIED
+        self._pending_ids.pop(approval_id, None)
+        approval.denied_epoch = time.time()
+        approval.denied_by = denied_by
         
         return {
             "success": True,
             "approval_id": approval_id,
-            "status": ApprovalStatus.DENIED.value,
+            "status": _DENIED,
             "message": "Operation denied successfully"
         }
     
+    def iter_pending_approvals(self, limit: Optional[int] = None) -> Iterator[ApprovalRecord]:
+        """
+        Lazily iterate over pending approval requests in creation order.
+        
+        Expired approvals are evicted once up front, so a caller that only
+        needs the first page never touches the rest of the queue.
+        
+        Args:
+            limit: Maximum number of approvals to yield (default: all)
+            
+        Returns:
+            Iterator over pending approval records
+        """
+        # Clean up expired approvals against the same clock reading used for the listing
+        now = time.time()
+        self._cleanup_expired_at(now)
+        
+        # Only still-pending IDs are visited, not every decided record in the store.
+        # The ID snapshot lets callers approve or deny while iterating.
+        approvals = self.pending_approvals
+        pending_ids = self._pending_ids
+        records = (
+            approvals[approval_id] for approval_id in tuple(pending_ids)
+            if approval_id in pending_ids and not self._is_expired_at(approvals[approval_id], now)
+        )
+        return itertools.islice(records, limit)
+    
     def get_pending_approvals(self) -> Dict[str, Any]:
         """
         Get all pending approval requests.
@@ -312,19 +440,7 @@ class SimpleApprovalManager:
         Returns:
             Dictionary containing list of pending approvals
         """
-        pending = []
-        expired_ids = []
-        
-        for approval_id, approval in self.pending_approvals.items():
-            if self._is_expired(approval):
-                approval["status"] = ApprovalStatus.EXPIRED.value
-                expired_ids.append(approval_id)
-            elif approval["status"] == ApprovalStatus.PENDING.value:
-                pending.append(approval)
-        
-        # Clean up expired approvals
-        for approval_id in expired_ids:
-            del self.pending_approvals[approval_id]
+        pending = [approval.to_dict() for approval in self.iter_pending_approvals()]
         
         return {
             "pending_approvals": pending,
@@ -335,35 +451,61 @@ class SimpleApprovalManager:
         """
         Clean up expired approval requests.
         
+        Pops the expiry heap until its head is in the future, so the cost is
+        proportional to the number of expired entries, not the store size.
+        
         Returns:
             Number of expired approvals cleaned up
         """
-        expired_ids = []
+        return self._cleanup_expired_at(time.time())
+    
+    def _cleanup_expired_at(self, now: float) -> int:
+        """
+        Evict approvals that expired before a given time.
         
-        for approval_id, approval in self.pending_approvals.items():
-            if self._is_expired(approval):
-                expired_ids.append(approval_id)
+        Args:
+            now: Current time in seconds since the epoch
+            
+        Returns:
+            Number of expired approvals cleaned up
+        """
+        removed = 0
         
-        for approval_id in expired_ids:
-            del self.pending_approvals[approval_id]
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            _, approval_id = heapq.heappop(self._expiry_heap)
+            approval = self.pending_approvals.pop(approval_id, None)
+            if approval is not None:
+                approval.status = _EXPIRED
+                self._pending_ids.pop(approval_id, None)
+                removed += 1
         
-        return len(expired_ids)
+        return removed
     
-    def _is_expired(self, approval: Dict[str, Any]) -> bool:
+    def _is_expired(self, approval: ApprovalRecord) -> bool:
         """
         Check if an approval request has expired.
         
         Args:
-            approval: Approval request dictionary
+            approval: Approval record
+            
+        Returns:
+            True if expired, False otherwise
+        """
+        return self._is_expired_at(approval, time.time())
+    
+    @staticmethod
+    def _is_expired_at(approval: ApprovalRecord, now: float) -> bool:
+        """
+        Check if an approval request had expired at a given time.
+        
+        Args:
+            approval: Approval record
+            now: Time to compare against, in seconds since the epoch
             
         Returns:
             True if expired, False otherwise
         """
-        try:
-            expires_at = datetime.fromisoformat(approval["expires_at"])
-            return datetime.now() > expires_at
-        except (ValueError, KeyError):
-            return True
+        return now > approval.expires_epoch
 
 
 # Global instance for the application
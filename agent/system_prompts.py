@@ -5,6 +5,9 @@ This module contains all the prompts used by the LLM-driven database agent,
 organized for better maintainability and readability.
 """
 
+import string
+from types import MappingProxyType
+
 # Main system prompt for the AI assistant
 SYSTEM_PROMPT = """You are a concise database assistant. Keep responses short and direct.
 
@@ -31,30 +34,43 @@ Response: "3 rows found:
 | 2  | Jane | jane@email.com |
 | 3  | Bob  | bob@email.com |"""
 
-# Router prompt for deciding next action
-ROUTER_PROMPT = """You are a database assistant router. Based on the user's message, decide what action to take.
+# Plan prompt: routes the message and writes the SQL in a single LLM call
+PLAN_PROMPT = """You are a database assistant. Decide how to handle the user's message and, if it needs the database, write the SQL in the same step.
 
 User message: {user_message}
 
-Recent conversation:
-{user_message}
+Database Type: {db_type}
+
+Available tables and columns:
+{schema}
 
 Available actions:
-- "database_operation": If the user wants to query, insert, update, delete, create tables, or get database info
+- "database_operation": If the user wants to query, insert, update, delete, create or alter tables, or get database info
 - "response": If the user is asking for help, explanation, or general conversation
 - "end": If the user wants to quit or end the conversation
 
-Key indicators for database_operation:
-- Creating tables ("create table", "make table", "add table", "new table")
-- SQL queries (SELECT, INSERT, UPDATE, DELETE, CREATE, ALTER, DROP)
-- Database operations ("show tables", "list tables", "table info", "how many table", "table count")
-- Data operations ("insert data", "update data", "delete data")
-- Schema queries ("table schema", "table structure", "columns", "describe table", "table info")
-- Table information ("tell me about table", "what's in table", "table details")
-- Database overview ("how many table in database", "table names", "list all tables")
-- Table creation with columns ("add new table X and add column Y, Z", "database name X and add column Y, Z")
+For "database_operation":
+- tables: the table names involved (for CREATE TABLE, the name of the new table)
+- sql: one valid {db_type} SQL statement that uses ONLY the tables and columns listed above, except for a table being created
+- For CREATE TABLE, include a primary key and sensible types and NOT NULL constraints
+
+For "response" and "end", leave tables empty and sql null."""
+
+# System prompts for stepwise SQL generation; static so providers can cache the prefix
+SQL_SYSTEM_PROMPT = """You are an expert SQL assistant. Return one SQL statement for the user's request in a ```sql block.
+
+CRITICAL RULES:
+1. Use ONLY the tables and columns listed in the schema.
+2. Do NOT invent new columns or tables.
+3. For INSERT/UPDATE, include all NOT NULL columns.
+4. For ALTER, use correct column names and types.
+5. Always output VALID SQL syntax for the database type."""
 
-Respond with ONLY the action name (database_operation, response, or end)."""
+CREATE_TABLE_SYSTEM_PROMPT = """You are an expert SQL assistant. Return one CREATE TABLE statement for the user's request in a ```sql block.
+
+Take the table and column names from the request. Use data types suited to the database type, a PRIMARY KEY, and NOT NULL/UNIQUE constraints where sensible.
+
+Example: "create table users with id, name, email" → CREATE TABLE users (id SERIAL PRIMARY KEY, name VARCHAR(255) NOT NULL, email VARCHAR(255) UNIQUE);"""
 
 # Operation prompt for database operations
 OPERATION_PROMPT = """You are a database assistant. The user wants to perform a database operation.
@@ -127,6 +143,12 @@ Provide a very brief response (under 3 to 4 sentences) based on the context and
 -if user ask any other topic that is not related so tell him 'I am designed to assist with database-related queries. For topics outside of databases, please refer to other resources or services.' .
 """
 
+# Summary of older conversation turns, kept in place of the turns themselves
+SUMMARY_PROMPT = """Summarize this conversation between a user and a database assistant in a few short lines.
+Keep table names, column names, SQL that was run and whether it succeeded. Leave out greetings and small talk.
+
+{conversation}"""
+
 # Help text for the agent
 HELP_TEXT = """
 **Database Agent Help**
@@ -151,8 +173,29 @@ HELP_TEXT = """
 The agent executes your requests immediately with safety checks!
 """
 
+# Ready-to-send replies for results that need no LLM wording, by statement verb
+RESULT_TEMPLATES = {
+    'SELECT': """✅ Query returned {row_count} row(s):
+```sql
+{sql}
+```
+{table}""",
+    'CREATE': """✅ Table created successfully:
+```sql
+{sql}
+```""",
+    'ALTER': """✅ Table altered successfully:
+```sql
+{sql}
+```""",
+    'DROP': """✅ Table dropped successfully:
+```sql
+{sql}
+```""",
+}
+
 # Database-specific SQL rules
-DATABASE_RULES = {
+DATABASE_RULES = MappingProxyType({
     'postgresql': """- Always use CREATE TABLE IF NOT EXISTS to avoid errors
 - Use SERIAL for auto-incrementing primary keys (not AUTOINCREMENT)
 - Use VARCHAR for text fields, INTEGER for numbers
@@ -176,19 +219,69 @@ DATABASE_RULES = {
 - Add NOT NULL for required fields
 - Add UNIQUE for unique fields
 - Use DEFAULT CURRENT_TIMESTAMP for created_at/updated_at"""
-}
+})
+
+# Rules used for database types without their own entry
+_DEFAULT_DATABASE_RULES = DATABASE_RULES['sqlite']
+
+def _parse_prompt(template: str) -> tuple:
+    """
+    Split a str.format template into (literal, field) chunks.
+    
+    Args:
+        template: Prompt template with plain {field} placeholders
+        
+    Returns:
+        Tuple of (literal text, field name or None) pairs
+    """
+    chunks = []
+    for literal, field, format_spec, conversion in string.Formatter().parse(template):
+        if format_spec or conversion:
+            raise ValueError(f"Unsupported placeholder in prompt template: {{{field}}}")
+        chunks.append((literal, field))
+    return tuple(chunks)
+
+def _compile_prompt(chunks: tuple):
+    """
+    Build a renderer from pre-parsed template chunks.
+    
+    The template is split into literal text and field names once, so rendering
+    only joins the literals with the field values.
+    
+    Args:
+        chunks: Output of _parse_prompt
+        
+    Returns:
+        Function taking the fields as keyword arguments and returning the prompt
+    """
+    def render(**fields) -> str:
+        parts = []
+        for literal, field in chunks:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(fields[field]))
+        return "".join(parts)
+    
+    return render
+
+# Renderers for the templated prompts, parsed once at import
+_render_plan = _compile_prompt(_parse_prompt(PLAN_PROMPT))
+_render_operation = _compile_prompt(_parse_prompt(OPERATION_PROMPT))
+_render_sql_generation = _compile_prompt(_parse_prompt(SQL_GENERATION_PROMPT))
+_render_response = _compile_prompt(_parse_prompt(RESPONSE_PROMPT))
+_render_summary = _compile_prompt(_parse_prompt(SUMMARY_PROMPT))
 
 def get_database_rules(db_type: str) -> str:
     """Get database-specific SQL rules."""
-    return DATABASE_RULES.get(db_type, DATABASE_RULES['sqlite'])
+    return DATABASE_RULES.get(db_type, _DEFAULT_DATABASE_RULES)
 
-def get_router_prompt(user_message: str) -> str:
-    """Get formatted router prompt."""
-    return ROUTER_PROMPT.format(user_message=user_message)
+def get_plan_prompt(user_message: str, db_type: str, schema: str) -> str:
+    """Get formatted plan prompt."""
+    return _render_plan(user_message=user_message, db_type=db_type, schema=schema)
 
 def get_operation_prompt(user_message: str, db_summary: dict) -> str:
     """Get formatted operation prompt."""
-    return OPERATION_PROMPT.format(
+    return _render_operation(
         user_message=user_message,
         total_tables=db_summary.get('total_tables', 0),
         table_names=db_summary.get('table_names', []),
@@ -197,7 +290,7 @@ def get_operation_prompt(user_message: str, db_summary: dict) -> str:
 
 def get_sql_generation_prompt(db_type: str, db_rules: str, example_create_sql: str, example_create_sql_admin: str) -> str:
     """Get formatted SQL generation prompt."""
-    return SQL_GENERATION_PROMPT.format(
+    return _render_sql_generation(
         db_type=db_type,
         db_type_upper=db_type.upper(),
         db_rules=db_rules,
@@ -205,6 +298,14 @@ def get_sql_generation_prompt(db_type: str, db_rules: str, example_create_sql: s
         example_create_sql_admin=example_create_sql_admin
     )
 
+def get_result_message(verb: str, sql: str, row_count: int = 0, table: str = "") -> str:
+    """Get formatted result message for a statement verb in RESULT_TEMPLATES."""
+    return RESULT_TEMPLATES[verb].format(sql=sql, row_count=row_count, table=table)
+
+def get_summary_prompt(conversation: str) -> str:
+    """Get formatted conversation summary prompt."""
+    return _render_summary(conversation=conversation)
+
 def get_response_prompt(context: str, user_message: str) -> str:
     """Get formatted response prompt."""
-    return RESPONSE_PROMPT.format(context=context, user_message=user_message)
+    return _render_response(context=context, user_message=user_message)
@@ -6,25 +6,163 @@ table management, and SQL query processing.
 """
 
 import re
-from typing import List, Optional, Dict, Any
-from sqlalchemy import create_engine, text, inspect
+import time
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy import create_engine, text
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
+from .utils import get_inspector
+
+# Table name in CREATE / DROP TABLE statements
+CREATE_TABLE_RE = re.compile(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)', re.IGNORECASE)
+DROP_TABLE_RE = re.compile(r'DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?(\w+)', re.IGNORECASE)
+
+# Table existence check per database type; the table name is a bound parameter,
+# so one compiled statement serves every table
+_INFORMATION_SCHEMA_EXISTS = text(
+    "SELECT EXISTS(SELECT 1 FROM information_schema.tables WHERE table_name = :table_name) AS table_exists"
+)
+TABLE_EXISTS_SQL = {
+    'postgresql': _INFORMATION_SCHEMA_EXISTS,
+    'mysql': _INFORMATION_SCHEMA_EXISTS,
+    'sqlite': text(
+        "SELECT EXISTS(SELECT 1 FROM sqlite_master WHERE type='table' AND name = :table_name) AS table_exists"
+    ),
+}
+
+# Column type by keyword in the column name for build_create_table_sql, first match wins
+TIMESTAMP_DEFAULT_NOW = "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+CREATE_COLUMN_TYPES = (
+    ('name', "TEXT NOT NULL"),
+    ('email', "TEXT UNIQUE"),
+    ('password', "TEXT"),
+    ('phone', "TEXT"),
+    ('address', "TEXT"),
+    ('created', TIMESTAMP_DEFAULT_NOW),  # also covers created_at
+    ('updated', TIMESTAMP_DEFAULT_NOW),  # also covers updated_at
+)
+
+# Column names that stand in for the default created_at / updated_at columns
+CREATED_COLUMNS = frozenset({'created_at', 'created'})
+UPDATED_COLUMNS = frozenset({'updated_at', 'updated'})
+
+# Column types for get_example_create_sql: exact names per type family, then timestamp keywords
+EXAMPLE_VARCHAR_TYPES = {'name': "VARCHAR(255) NOT NULL", 'email': "VARCHAR(255) UNIQUE"}
+EXAMPLE_TEXT_TYPES = {'name': "TEXT NOT NULL", 'email': "TEXT UNIQUE"}
+EXAMPLE_TIMESTAMP_TYPES = (('created_at', TIMESTAMP_DEFAULT_NOW), ('updated_at', TIMESTAMP_DEFAULT_NOW))
+
+# Per database type: (id column, exact-name types, default type); unknown types use SQLite
+EXAMPLE_DIALECTS = {
+    'postgresql': ("id SERIAL PRIMARY KEY", EXAMPLE_VARCHAR_TYPES, "VARCHAR(255)"),
+    'mysql': ("id INT AUTO_INCREMENT PRIMARY KEY", EXAMPLE_VARCHAR_TYPES, "VARCHAR(255)"),
+    'sqlite': ("id INTEGER PRIMARY KEY AUTOINCREMENT", EXAMPLE_TEXT_TYPES, "TEXT"),
+}
+
+
+def _column_type(col_lower: str, type_rules, default: str, exact_types: Optional[Dict[str, str]] = None) -> str:
+    """
+    Pick a SQL column type from the column name.
+    
+    Args:
+        col_lower: Lowercased column name
+        type_rules: (keyword, type) pairs; the first keyword contained in the name wins
+        default: Type used when nothing matches
+        exact_types: Types for whole column names, checked before the keywords
+        
+    Returns:
+        SQL type (with constraints) for the column
+    """
+    if exact_types:
+        sql_type = exact_types.get(col_lower)
+        if sql_type is not None:
+            return sql_type
+    for keyword, sql_type in type_rules:
+        if keyword in col_lower:
+            return sql_type
+    return default
+
+# Punctuation dropped from words taken from a user message
+PUNCTUATION_TABLE = str.maketrans('', '', '.,!?;:')
+
+# Phrases that precede a table name in a user message; order matters, more specific first
+TABLE_KEYWORDS = (
+    "database name",  # "database name admin" - MUST be first
+    "table name",     # "table name admin" - MUST be second
+    "create table",   # "create table admin"
+    "make table",     # "make table admin"
+    "add table",      # "add table admin"
+    "new table",      # "new table admin" - least specific, last
+    "name table"      # "name admin table"
+)
+
+# Phrases that precede a column list in a user message, in priority order
+COLUMN_KEYWORDS = ("add colom", "add column", "columns", "with columns", "add col", "coloms")
+
+
+def _keyword_scanner(keywords):
+    """
+    Compile a keyword list into one lookahead alternation.
+    
+    Being zero-width, the lookahead can match at every start position, so one
+    pass finds keywords that overlap other keywords. At each position only one
+    keyword is reported, the first in list order that matches there; a shorter
+    keyword sharing its start (e.g. "add col" under "add column") is not.
+    """
+    return re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+
+TABLE_KEYWORD_RE = _keyword_scanner(TABLE_KEYWORDS)
+COLUMN_KEYWORD_RE = _keyword_scanner(COLUMN_KEYWORDS)
+
+
+def _find_keywords(keyword_re, keywords, message_lower: str) -> List[Tuple[str, int]]:
+    """
+    Locate the first occurrence of each keyword in one scan of the message.
+    
+    Args:
+        keyword_re: Scanner built by _keyword_scanner for the keywords
+        keywords: Keywords in priority order
+        message_lower: Lowercased user message
+        
+    Returns:
+        (keyword, position) pairs for the keywords found, in priority order
+    """
+    first_pos = {}
+    for match in keyword_re.finditer(message_lower):
+        first_pos.setdefault(match.group(1), match.start())
+    return [(keyword, first_pos[keyword]) for keyword in keywords if keyword in first_pos]
+
 
 class DatabaseTools:
     """Utility class for database operations and helper functions."""
     
-    def __init__(self, engine, db_type: str):
+    def __init__(self, engine, db_type: str, table_names_ttl: float = 5.0):
         """
         Initialize database tools.
         
         Args:
             engine: SQLAlchemy engine instance
             db_type: Type of database (postgresql, mysql, sqlite)
+            table_names_ttl: Seconds a listing of table names is reused
         """
         self.engine = engine
         self.db_type = db_type
+        self.table_names_ttl = table_names_ttl
+        
+        # (monotonic time listed, table names, casefolded names); names are None until listed
+        self._tables_cache: Tuple[float, Optional[List[str]], frozenset] = (0.0, None, frozenset())
+    
+    def invalidate_cache(self) -> None:
+        """Forget the cached table names; call after CREATE/DROP TABLE."""
+        self._tables_cache = (0.0, None, frozenset())
+    
+    def _fresh_tables_cache(self) -> Optional[Tuple[float, List[str], frozenset]]:
+        """Return the table-name cache entry if it is still within its TTL, otherwise None."""
+        cache = self._tables_cache
+        if cache[1] is not None and time.monotonic() - cache[0] < self.table_names_ttl:
+            return cache
+        return None
     
     def extract_table_name_from_create(self, sql_query: str) -> Optional[str]:
         """
@@ -36,12 +174,8 @@ class DatabaseTools:
         Returns:
             Table name if found, None otherwise
         """
-        try:
-            pattern = r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)'
-            match = re.search(pattern, sql_query, re.IGNORECASE)
-            return match.group(1) if match else None
-        except Exception:
-            return None
+        match = CREATE_TABLE_RE.search(sql_query)
+        return match.group(1) if match else None
     
     def extract_table_name_from_drop(self, sql_query: str) -> Optional[str]:
         """
@@ -53,12 +187,8 @@ class DatabaseTools:
         Returns:
             Table name if found, None otherwise
         """
-        try:
-            pattern = r'DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?(\w+)'
-            match = re.search(pattern, sql_query, re.IGNORECASE)
-            return match.group(1) if match else None
-        except Exception:
-            return None
+        match = DROP_TABLE_RE.search(sql_query)
+        return match.group(1) if match else None
     
     def extract_table_name_from_message(self, message: str) -> Optional[str]:
         """
@@ -73,53 +203,16 @@ class DatabaseTools:
         try:
             message_lower = message.lower()
             
-            # Simple keyword-based extraction - much more reliable than regex
-            # Order matters! More specific patterns first
-            keywords = [
-                "database name",  # "database name admin" - MUST be first
-                "table name",     # "table name admin" - MUST be second
-                "create table",   # "create table admin"
-                "make table",     # "make table admin"
-                "add table",      # "add table admin"
-                "new table",      # "new table admin" - least specific, last
-                "name table"      # "name admin table"
-            ]
-            
-            for keyword in keywords:
-                if keyword in message_lower:
-                    # Find the word after the keyword
-                    keyword_pos = message_lower.find(keyword)
-                    after_keyword = message[keyword_pos + len(keyword):].strip()
-                    
-                    # Get the first word after the keyword
-                    words = after_keyword.split()
-                    if words:
-                        # Clean the word (remove punctuation)
-                        table_name = words[0].strip(".,!?;:")
-                        if table_name and len(table_name) > 0:
-                            return table_name
-            
-            # Special case: look for "database name X" pattern
-            if "database name" in message_lower:
-                parts = message_lower.split("database name")
-                if len(parts) > 1:
-                    after_db_name = parts[1].strip()
-                    words = after_db_name.split()
-                    if words:
-                        table_name = words[0].strip(".,!?;:")
-                        if table_name and len(table_name) > 0:
-                            return table_name
-            
-            # Special case: look for "table name X" pattern  
-            if "table name" in message_lower:
-                parts = message_lower.split("table name")
-                if len(parts) > 1:
-                    after_table_name = parts[1].strip()
-                    words = after_table_name.split()
-                    if words:
-                        table_name = words[0].strip(".,!?;:")
-                        if table_name and len(table_name) > 0:
-                            return table_name
+            # Keyword-based extraction; all keywords are located in one pass and
+            # tried in TABLE_KEYWORDS priority order
+            for keyword, keyword_pos in _find_keywords(TABLE_KEYWORD_RE, TABLE_KEYWORDS, message_lower):
+                # Get the first word after the keyword, splitting off only that word
+                words = message[keyword_pos + len(keyword):].split(None, 1)
+                if words:
+                    # Clean the word (remove punctuation)
+                    table_name = words[0].translate(PUNCTUATION_TABLE)
+                    if table_name:
+                        return table_name
             
             return None
         except Exception:
@@ -138,38 +231,32 @@ class DatabaseTools:
         try:
             message_lower = message.lower()
             
-            # Look for column keywords
-            column_keywords = [
-                "add colom", "add column", "columns", "with columns", "add col", "coloms"
-            ]
-            
-            for keyword in column_keywords:
-                if keyword in message_lower:
-                    # Find the text after the keyword
-                    keyword_pos = message_lower.find(keyword)
-                    after_keyword = message[keyword_pos + len(keyword):].strip()
-                    
-                    # Look for comma-separated values
-                    if ',' in after_keyword:
-                        # Split by comma and clean up
+            # Look for column keywords, all located in one pass
+            for keyword, keyword_pos in _find_keywords(COLUMN_KEYWORD_RE, COLUMN_KEYWORDS, message_lower):
+                # Find the text after the keyword
+                after_keyword = message[keyword_pos + len(keyword):].strip()
+                
+                # Look for comma-separated values
+                if ',' in after_keyword:
+                    # Split by comma and clean up
+                    columns = []
+                    for col in after_keyword.split(','):
+                        col = col.strip().replace(' ', '_').lower()
+                        if col and len(col) > 0:
+                            columns.append(col)
+                    if columns:
+                        return columns
+                else:
+                    # Single column or space-separated
+                    words = after_keyword.split()
+                    if words:
                         columns = []
-                        for col in after_keyword.split(','):
-                            col = col.strip().replace(' ', '_').lower()
+                        for word in words:
+                            col = word.translate(PUNCTUATION_TABLE).replace(' ', '_').lower()
                             if col and len(col) > 0:
                                 columns.append(col)
                         if columns:
                             return columns
-                    else:
-                        # Single column or space-separated
-                        words = after_keyword.split()
-                        if words:
-                            columns = []
-                            for word in words:
-                                col = word.strip(".,!?;:").replace(' ', '_').lower()
-                                if col and len(col) > 0:
-                                    columns.append(col)
-                            if columns:
-                                return columns
             
             # Special handling for "coloms" (user's typo)
             if "coloms" in message_lower:
@@ -182,7 +269,7 @@ class DatabaseTools:
                     columns = []
                     i = 0
                     while i < len(words):
-                        word = words[i].strip(".,!?;:").lower()
+                        word = words[i].translate(PUNCTUATION_TABLE).lower()
                         if word and len(word) > 0:
                             # Check if this is part of a multi-word column
                             if word in ['created', 'updated'] and i + 1 < len(words) and words[i + 1].lower() == 'at':
@@ -220,36 +307,19 @@ class DatabaseTools:
             # Track which columns we've already added to avoid duplicates
             added_columns = {"id"}
             
-            # Add other columns with simple logic
-            for col in columns:
-                col_lower = col.lower().strip()
-                if col_lower and col_lower not in added_columns and col_lower != 'id':
-                    # Simple column type assignment
-                    if 'name' in col_lower:
-                        sql_parts.append(f"{col} TEXT NOT NULL")
-                    elif 'email' in col_lower:
-                        sql_parts.append(f"{col} TEXT UNIQUE")
-                    elif 'password' in col_lower:
-                        sql_parts.append(f"{col} TEXT")
-                    elif 'phone' in col_lower:
-                        sql_parts.append(f"{col} TEXT")
-                    elif 'address' in col_lower:
-                        sql_parts.append(f"{col} TEXT")
-                    elif 'created_at' in col_lower or 'created' in col_lower:
-                        sql_parts.append(f"{col} TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-                    elif 'updated_at' in col_lower or 'updated' in col_lower:
-                        sql_parts.append(f"{col} TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-                    else:
-                        # Default to TEXT for any other column
-                        sql_parts.append(f"{col} TEXT")
+            # Add other columns with simple logic; names are normalized once up front
+            for col, col_lower in zip(columns, [col.lower().strip() for col in columns]):
+                if col_lower and col_lower not in added_columns:
+                    # Simple column type assignment; anything unmatched is TEXT
+                    sql_parts.append(f"{col} {_column_type(col_lower, CREATE_COLUMN_TYPES, 'TEXT')}")
                     
                     added_columns.add(col_lower)
             
             # Add default timestamps if not already present
-            if 'created_at' not in added_columns and 'created' not in added_columns:
-                sql_parts.append("created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-            if 'updated_at' not in added_columns and 'updated' not in added_columns:
-                sql_parts.append("updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+            if added_columns.isdisjoint(CREATED_COLUMNS):
+                sql_parts.append(f"created_at {TIMESTAMP_DEFAULT_NOW}")
+            if added_columns.isdisjoint(UPDATED_COLUMNS):
+                sql_parts.append(f"updated_at {TIMESTAMP_DEFAULT_NOW}")
             
             return f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(sql_parts)})"
         except Exception:
@@ -264,7 +334,7 @@ class DatabaseTools:
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )"""
     
-    def get_table_exists_query(self, table_name: str) -> str:
+    def get_table_exists_query(self, table_name: str) -> Tuple[TextClause, Dict[str, str]]:
         """
         Get database-specific query to check if a table exists.
         
@@ -272,29 +342,10 @@ class DatabaseTools:
             table_name: Name of the table to check
             
         Returns:
-            SQL query to check table existence
+            Bound-parameter statement and its parameters, ready for conn.execute
         """
-        if self.db_type == 'postgresql':
-            return f"""
-                SELECT EXISTS(
-                    SELECT 1 FROM information_schema.tables 
-                    WHERE table_name = '{table_name}'
-                ) AS table_exists
-            """
-        elif self.db_type == 'mysql':
-            return f"""
-                SELECT EXISTS(
-                    SELECT 1 FROM information_schema.tables 
-                    WHERE table_name = '{table_name}'
-                ) AS table_exists
-            """
-        else:  # SQLite
-            return f"""
-                SELECT EXISTS(
-                    SELECT 1 FROM sqlite_master 
-                    WHERE type='table' AND name='{table_name}'
-                ) AS table_exists
-            """
+        statement = TABLE_EXISTS_SQL.get(self.db_type, TABLE_EXISTS_SQL['sqlite'])
+        return statement, {"table_name": table_name}
     
     def verify_table_exists(self, table_name: str) -> bool:
         """
@@ -306,33 +357,15 @@ class DatabaseTools:
         Returns:
             True if table exists, False otherwise
         """
+        # A fresh table listing answers without a round trip
+        cache = self._fresh_tables_cache()
+        if cache is not None:
+            # Exact match, like the case-sensitive TABLE_EXISTS_SQL lookup below
+            return table_name in cache[2]
+        
         try:
             with self.engine.connect() as conn:
-                if self.db_type == 'postgresql':
-                    # PostgreSQL-specific query
-                    result = conn.execute(text(f"""
-                        SELECT EXISTS(
-                            SELECT 1 FROM information_schema.tables 
-                            WHERE table_name = '{table_name}'
-                        ) AS table_exists
-                    """))
-                elif self.db_type == 'mysql':
-                    # MySQL-specific query
-                    result = conn.execute(text(f"""
-                        SELECT EXISTS(
-                            SELECT 1 FROM information_schema.tables 
-                            WHERE table_name = '{table_name}'
-                        ) AS table_exists
-                    """))
-                else:
-                    # SQLite-specific query (default)
-                    result = conn.execute(text(f"""
-                        SELECT EXISTS(
-                            SELECT 1 FROM sqlite_master 
-                            WHERE type='table' AND name='{table_name}'
-                        ) AS table_exists
-                    """))
-                row = result.fetchone()
+                row = conn.execute(*self.get_table_exists_query(table_name)).fetchone()
                 return bool(row[0]) if row else False
         except Exception:
             return False
@@ -342,13 +375,19 @@ class DatabaseTools:
         Get all table names from the database.
         
         Returns:
-            List of table names
+            List of table names, reused for table_names_ttl seconds
         """
+        cache = self._fresh_tables_cache()
+        if cache is not None:
+            return cache[1]
+        
         try:
-            inspector = inspect(self.engine)
-            return inspector.get_table_names()
+            inspector = get_inspector(self.engine)
+            tables = inspector.get_table_names()
         except Exception:
             return []
+        self._tables_cache = (time.monotonic(), tables, frozenset(tables))
+        return tables
     
     def get_example_create_sql(self, table_name: str, columns: List[str]) -> str:
         """
@@ -361,44 +400,8 @@ class DatabaseTools:
         Returns:
             Example CREATE TABLE SQL statement
         """
-        if self.db_type == 'postgresql':
-            # PostgreSQL syntax
-            sql_parts = ["id SERIAL PRIMARY KEY"]
-            for col in columns:
-                if col.lower() == 'name':
-                    sql_parts.append(f"{col} VARCHAR(255) NOT NULL")
-                elif col.lower() == 'email':
-                    sql_parts.append(f"{col} VARCHAR(255) UNIQUE")
-                elif 'created_at' in col.lower() or 'updated_at' in col.lower():
-                    sql_parts.append(f"{col} TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-                else:
-                    sql_parts.append(f"{col} VARCHAR(255)")
-            return f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(sql_parts)})"
-        
-        elif self.db_type == 'mysql':
-            # MySQL syntax
-            sql_parts = ["id INT AUTO_INCREMENT PRIMARY KEY"]
-            for col in columns:
-                if col.lower() == 'name':
-                    sql_parts.append(f"{col} VARCHAR(255) NOT NULL")
-                elif col.lower() == 'email':
-                    sql_parts.append(f"{col} VARCHAR(255) UNIQUE")
-                elif 'created_at' in col.lower() or 'updated_at' in col.lower():
-                    sql_parts.append(f"{col} TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-                else:
-                    sql_parts.append(f"{col} VARCHAR(255)")
-            return f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(sql_parts)})"
-        
-        else:  # SQLite
-            # SQLite syntax
-            sql_parts = ["id INTEGER PRIMARY KEY AUTOINCREMENT"]
-            for col in columns:
-                if col.lower() == 'name':
-                    sql_parts.append(f"{col} TEXT NOT NULL")
-                elif col.lower() == 'email':
-                    sql_parts.append(f"{col} TEXT UNIQUE")
-                elif 'created_at' in col.lower() or 'updated_at' in col.lower():
-                    sql_parts.append(f"{col} TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
-                else:
-                    sql_parts.append(f"{col} TEXT")
-            return f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(sql_parts)})"
+        id_column, exact_types, default_type = EXAMPLE_DIALECTS.get(self.db_type, EXAMPLE_DIALECTS['sqlite'])
+        sql_parts = [id_column]
+        for col in columns:
+            sql_parts.append(f"{col} {_column_type(col.lower(), EXAMPLE_TIMESTAMP_TYPES, default_type, exact_types)}")
+        return f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(sql_parts)})"
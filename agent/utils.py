@@ -1,7 +1,206 @@
-from sqlalchemy import inspect, text
+from sqlalchemy import bindparam, inspect, text
+from typing import Dict, Optional, Tuple
 import json
+import logging
+import re
+import threading
+import time
 
-def get_full_database_schema(engine):
+logger = logging.getLogger(__name__)
+
+# Seconds a full schema walk is reused before the database is inspected again
+SCHEMA_CACHE_TTL = 60.0
+
+# (engine URL, include_samples) -> (monotonic time fetched, schema info)
+_SCHEMA_CACHE: Dict[Tuple[str, bool], Tuple[float, dict]] = {}
+
+
+# (thread id, engine) -> Inspector. Each thread gets its own Inspector, so a
+# refresh in one asyncio.to_thread worker never clears another worker's
+# reflection cache halfway through its walk.
+_INSPECTORS: Dict[Tuple[int, object], object] = {}
+_INSPECTORS_LOCK = threading.Lock()
+
+
+def get_inspector(engine, refresh: bool = True):
+    """
+    Get the calling thread's reusable Inspector for an engine instead of building one per call.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        refresh: Clear the Inspector's reflection cache first, so results reflect
+            the live database (pass False only within a single walk)
+
+    Returns:
+        Inspector bound to the engine
+    """
+    key = (threading.get_ident(), engine)
+    inspector = _INSPECTORS.get(key)
+    if inspector is None:
+        inspector = inspect(engine)
+        with _INSPECTORS_LOCK:
+            _INSPECTORS[key] = inspector
+    elif refresh:
+        inspector.clear_cache()
+    return inspector
+
+
+def clear_inspectors() -> None:
+    """Drop every cached Inspector, releasing the engines they hold; call when engines are disposed."""
+    with _INSPECTORS_LOCK:
+        _INSPECTORS.clear()
+
+
+def invalidate_schema_cache(engine=None) -> None:
+    """
+    Forget cached full-schema results, e.g. after CREATE/ALTER/DROP TABLE.
+
+    Args:
+        engine: Only drop entries for this engine's URL (default: drop all)
+    """
+    if engine is None:
+        _SCHEMA_CACHE.clear()
+        return
+    url = str(engine.url)
+    for key in [key for key in _SCHEMA_CACHE if key[0] == url]:
+        del _SCHEMA_CACHE[key]
+
+
+# Row-count estimates from the database's statistics, one query for all tables;
+# dialects without an entry (and tables the statistics do not cover) use COUNT(*)
+_APPROX_ROW_COUNT_SQL = {
+    dialect: text(sql).bindparams(bindparam("names", expanding=True))
+    for dialect, sql in (
+        ("postgresql",
+         "SELECT relname, reltuples::bigint FROM pg_class "
+         "WHERE relkind IN ('r', 'p') AND relname IN :names"),
+        ("mysql",
+         "SELECT table_name, table_rows FROM information_schema.tables "
+         "WHERE table_schema = DATABASE() AND table_name IN :names"),
+        # Present only after ANALYZE; the leading integer of stat is the table's row count
+        ("sqlite",
+         "SELECT tbl, MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 "
+         "WHERE tbl IN :names GROUP BY tbl"),
+    )
+}
+
+
+def _approximate_row_counts(conn, tables) -> Dict[str, int]:
+    """
+    Read estimated row counts for many tables in a single round trip.
+
+    Args:
+        conn: Open connection
+        tables: Names of the tables to estimate
+
+    Returns:
+        dict: Table name -> estimated row count, for the tables the statistics cover
+    """
+    statement = _APPROX_ROW_COUNT_SQL.get(conn.dialect.name)
+    if statement is None or not tables:
+        return {}
+    try:
+        rows = conn.execute(statement, {"names": list(tables)})
+        # Negative estimates (e.g. a never-analyzed PostgreSQL table) mean unknown
+        return {name: int(count) for name, count in rows if count is not None and count >= 0}
+    except Exception:
+        conn.rollback()
+        return {}
+
+
+# Column types worth showing the LLM in example rows (base type name, upper case);
+# binary, JSON and other bulky or opaque columns are left out of the sample query
+_SAMPLE_COLUMN_TYPES = frozenset({
+    "INTEGER", "INT", "BIGINT", "SMALLINT", "NUMERIC", "DECIMAL", "REAL", "FLOAT", "DOUBLE",
+    "VARCHAR", "CHAR", "TEXT", "DATE", "DATETIME", "TIMESTAMP", "BOOLEAN",
+})
+_SAMPLE_TEXT_TYPES = frozenset({"VARCHAR", "CHAR", "TEXT"})
+_SAMPLE_TEXT_CHARS = 64  # characters kept from each text value
+_SAMPLE_MAX_BYTES = 2048  # serialized example-row budget per table
+
+# Prefix of a text value, per dialect; others use the SQL-standard SUBSTRING
+_TEXT_PREFIX_SQL = {
+    "sqlite": "substr({column}, 1, {chars})",
+    "postgresql": "left({column}, {chars})",
+    "mysql": "left({column}, {chars})",
+}
+_BASE_TYPE_RE = re.compile(r"\w+")
+
+
+def _sample_query(dialect, table_name: str, columns) -> Optional[str]:
+    """
+    Build the example-row query for a table, projecting only LLM-useful columns.
+
+    Args:
+        dialect: SQLAlchemy dialect of the engine
+        table_name: Name of the table
+        columns: Column info dicts with "name" and "type" keys
+
+    Returns:
+        SELECT statement for up to 3 rows, or None if no column is worth sampling
+    """
+    quote = dialect.identifier_preparer.quote
+    prefix_sql = _TEXT_PREFIX_SQL.get(dialect.name, "SUBSTRING({column} FROM 1 FOR {chars})")
+    projected = []
+    for col in columns:
+        match = _BASE_TYPE_RE.match(col["type"].upper())
+        base_type = match.group(0) if match else ""
+        if base_type not in _SAMPLE_COLUMN_TYPES:
+            continue
+        column = quote(col["name"])
+        if base_type in _SAMPLE_TEXT_TYPES:
+            projected.append(f"{prefix_sql.format(column=column, chars=_SAMPLE_TEXT_CHARS)} AS {column}")
+        else:
+            projected.append(column)
+    if not projected:
+        return None
+    return f"SELECT {', '.join(projected)} FROM {quote(table_name)} LIMIT 3"
+
+
+def _fetch_samples(engine, table_columns) -> Dict[str, Tuple[Optional[int], list]]:
+    """
+    Fetch the row count and up to 3 example rows of each table over one connection.
+
+    Row counts come from the database's statistics where available, so they may
+    be approximate; only tables without statistics are counted exactly. Example
+    rows hold only scalar columns, with text truncated and at most
+    _SAMPLE_MAX_BYTES of serialized rows per table.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        table_columns: Table name -> column info dicts with "name" and "type" keys
+
+    Returns:
+        dict: Table name -> (row count or None, example rows)
+    """
+    samples = {}
+    with engine.connect() as conn:
+        estimates = _approximate_row_counts(conn, list(table_columns))
+        for table_name, columns in table_columns.items():
+            row_count, example_rows = estimates.get(table_name), []
+            try:
+                if row_count is None:
+                    row_count = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar()
+                
+                # Get up to 3 sample rows for better understanding; estimates can be stale,
+                # so only an exact zero skips the lookup
+                sample_sql = _sample_query(engine.dialect, table_name, columns)
+                if sample_sql and (row_count > 0 or table_name in estimates):
+                    budget = _SAMPLE_MAX_BYTES
+                    for row in conn.execute(text(sample_sql)):
+                        example = dict(row._mapping)
+                        budget -= len(json.dumps(example, default=str))
+                        if budget < 0:
+                            break
+                        example_rows.append(example)
+            except Exception:
+                # Access denied or similar; a failed statement must not poison the next table's queries
+                conn.rollback()
+            samples[table_name] = (row_count, example_rows)
+    return samples
+
+
+def get_full_database_schema(engine, include_samples: bool = False, ttl: float = SCHEMA_CACHE_TTL):
     """
     Extracts and returns a complete database schema with enhanced information:
     - Table names
@@ -12,15 +211,24 @@ def get_full_database_schema(engine):
     - Index information
     - Table comments/descriptions
 
+    Results are cached per engine URL for ``ttl`` seconds; errors are not cached.
+
     Args:
         engine: SQLAlchemy engine instance
+        include_samples: Also fetch each table's row count and up to 3 example rows
+        ttl: Seconds a cached result is reused; 0 always inspects the database
 
     Returns:
         dict: Complete schema information optimized for LLM consumption
     """
-    print("<=== get_full_database_schema ===>")
+    logger.debug("<=== get_full_database_schema ===>")
+    key = (str(engine.url), include_samples)
+    cached = _SCHEMA_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < ttl:
+        return cached[1]
+
     try:
-        inspector = inspect(engine)
+        inspector = get_inspector(engine)
         tables = inspector.get_table_names()
 
         schema_info = {
@@ -70,22 +278,6 @@ def get_full_database_schema(engine):
                 }
                 column_info.append(col_data)
 
-            # Try to fetch sample data for better context
-            example_rows = []
-            row_count = 0
-            try:
-                with engine.connect() as conn:
-                    # Get row count
-                    count_result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-                    row_count = count_result.scalar()
-                    
-                    # Get up to 3 sample rows for better understanding
-                    if row_count > 0:
-                        result = conn.execute(text(f"SELECT * FROM {table_name} LIMIT 3"))
-                        example_rows = [dict(row._mapping) for row in result]
-            except Exception:
-                pass  # Ignore if access denied or no rows
-
             schema_info["tables"][table_name] = {
                 "columns": column_info,
                 "primary_keys": primary_keys,
@@ -98,17 +290,26 @@ def get_full_database_schema(engine):
                     }
                     for idx in indexes
                 ],
-                "row_count": row_count,
-                "example_rows": example_rows,
+                "row_count": None,
+                "example_rows": [],
                 "comment": table_comment
             }
 
-        # Pretty print the schema
-        print(json.dumps(schema_info, indent=2))
+        # Optionally fetch sample data for better context
+        if include_samples:
+            table_columns = {name: table["columns"] for name, table in schema_info["tables"].items()}
+            for table_name, (row_count, example_rows) in _fetch_samples(engine, table_columns).items():
+                schema_info["tables"][table_name]["row_count"] = row_count
+                schema_info["tables"][table_name]["example_rows"] = example_rows
+
+        # Pretty print the schema only when debug logging is on; serializing it is not free
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s", json.dumps(schema_info, indent=2, default=str))
+        _SCHEMA_CACHE[key] = (time.monotonic(), schema_info)
         return schema_info
 
     except Exception as e:
-        print(f"❌ Error fetching schema: {str(e)}")
+        logger.error("❌ Error fetching schema: %s", e)
         return {"error": str(e)}
 
 
@@ -136,10 +337,10 @@ def get_table_schema(engine, table_name: str):
     Raises:
         Exception: If table not found or database error occurs.
     """
-    print(f"<=== get_table_schema: {table_name} ===>")
+    logger.debug("<=== get_table_schema: %s ===>", table_name)
 
     try:
-        inspector = inspect(engine)
+        inspector = get_inspector(engine)
 
         # Get all available tables
         tables = inspector.get_table_names()
@@ -159,15 +360,17 @@ def get_table_schema(engine, table_name: str):
             })
 
         # Nicely log the schema
-        print(f"==> ✅ Table '{table_name}' Schema:")
-        for col in schema:
-            print(f"   - {col['column_name']} ({col['data_type']})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "==> ✅ Table '%s' Schema:\n%s", table_name,
+                "\n".join(f"   - {col['column_name']} ({col['data_type']})" for col in schema)
+            )
 
         return schema
 
     except Exception as e:
         error_msg = str(e)
-        print(f"❌ Database error while getting schema for '{table_name}': {error_msg}")
+        logger.error("❌ Database error while getting schema for '%s': %s", table_name, error_msg)
         
         # Provide more specific error messages
         if "no such table" in error_msg.lower() or "table" in error_msg.lower() and "not found" in error_msg.lower():
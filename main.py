@@ -8,14 +8,25 @@ from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 import json
 import asyncio
+import logging
 from datetime import datetime
 from agent.main_agent import DatabaseAgent
 from agent.simple_approval import simple_approval_manager
+from agent.config import dispose_engine, DEBUG
 from fastapi.middleware.cors import CORSMiddleware
 import threading
 import uuid
 from fastapi import Query
 
+# Agent tracing is logged at DEBUG level; set AGENT_DEBUG=1 to see it
+logging.basicConfig(format="%(levelname)s %(name)s: %(message)s")
+logging.getLogger("agent").setLevel(logging.DEBUG if DEBUG else logging.WARNING)
+
+
+def sse_event(data: Dict[str, Any]) -> bytes:
+    """Encode one server-sent event as compact UTF-8 JSON bytes."""
+    return b"data: " + json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode() + b"\n\n"
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -100,6 +111,12 @@ async def startup_event():
         print(f"❌ Failed to initialize agent: {str(e)}")
         raise e
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    if agent is not None:
+        await agent.aclose()
+    dispose_engine()
+
 @app.get("/")
 async def root():
     """Root endpoint with basic info"""
@@ -119,7 +136,7 @@ async def health_check():
     """Health check endpoint"""
     try:
         # Test database connection
-        db_info = agent.get_database_info()
+        db_info = await agent.aget_database_info()
         return {
             "status": "healthy",
             "database_connected": "error" not in db_info,
@@ -136,7 +153,7 @@ async def health_check():
 async def get_database_info():
     """Get database information"""
     try:
-        db_info = agent.get_database_info()
+        db_info = await agent.aget_database_info()
         return DatabaseInfo(
             total_tables=db_info.get("total_tables", 0),
             table_names=list(db_info.get("tables", {}).keys()),
@@ -150,7 +167,7 @@ async def chat(request: ChatRequest):
     """Chat with the database agent using thread-based conversation"""
     try:
         # Get agent response with thread support
-        response = agent.chat(request.query, request.thread_id)
+        response = await agent.handle(request.query, request.thread_id)
         
         # Get the thread ID that was used (either provided or newly created)
         thread_id = request.thread_id or "default"
@@ -210,7 +227,7 @@ async def chat_stream(request: ChatRequest):
     async def generate_stream():
         try:
             # Get the full response from the agent with thread support
-            response = agent.chat(request.query, thread_id)
+            response = await agent.handle(request.query, thread_id)
             
             # Check if this is a human approval request
             if "DANGEROUS OPERATION DETECTED" in response or "⚠️" in response or "**Approval ID:**" in response or "Dangerous operation detected" in response:
@@ -224,7 +241,7 @@ async def chat_stream(request: ChatRequest):
                     "requires_approval": True,
                     "timestamp": datetime.now().isoformat()
                 }
-                yield f"data: {json.dumps(approval_data)}\n\n"
+                yield sse_event(approval_data)
                 return
             
             # Split response into words for streaming effect
@@ -244,7 +261,7 @@ async def chat_stream(request: ChatRequest):
                             "session_id": session_id,
                             "timestamp": datetime.now().isoformat()
                         }
-                        yield f"data: {json.dumps(stop_data)}\n\n"
+                        yield sse_event(stop_data)
                         return
                 
                 chunk = " ".join(words[i:i + 2])
@@ -261,7 +278,7 @@ async def chat_stream(request: ChatRequest):
                     "timestamp": datetime.now().isoformat()
                 }
                 
-                yield f"data: {json.dumps(stream_data)}\n\n"
+                yield sse_event(stream_data)
                 
                 # Check again after sending chunk
                 with session_lock:
@@ -275,7 +292,7 @@ async def chat_stream(request: ChatRequest):
                             "session_id": session_id,
                             "timestamp": datetime.now().isoformat()
                         }
-                        yield f"data: {json.dumps(stop_data)}\n\n"
+                        yield sse_event(stop_data)
                         return
                 
                 await asyncio.sleep(0.02)  # Very fast streaming - 20ms delay
@@ -294,7 +311,7 @@ async def chat_stream(request: ChatRequest):
                 "session_id": session_id,
                 "timestamp": datetime.now().isoformat()
             }
-            yield f"data: {json.dumps(error_data)}\n\n"
+            yield sse_event(error_data)
         finally:
             # Clean up session
             with session_lock:
@@ -321,13 +338,14 @@ async def get_table_data(table_name: str, limit: int = 10):
             raise HTTPException(status_code=400, detail="Invalid table name")
         
         query = f"SELECT * FROM {table_name} LIMIT {limit}"
-        result = agent.execute_sql_query(query)
+        result = await agent.aexecute_sql_query(query)
         
         if result.get("success"):
+            columns = result.get("columns", [])
             return {
                 "success": True,
-                "data": result.get("data", []),
-                "columns": result.get("columns", []),
+                "data": [dict(zip(columns, row)) for row in result.get("data", [])],
+                "columns": columns,
                 "row_count": result.get("row_count", 0),
                 "table_name": table_name,
                 "limit": limit,
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the agent's reply path without requiring an LLM connection.
+
+The agent runs against a throwaway SQLite file and its reply batcher is pointed
+at a stand-in runnable, so no request leaves the process.
+"""
+
+import asyncio
+import os
+import tempfile
+
+from langchain_core.messages import AIMessage, SystemMessage
+
+from agent import config
+from agent.config import AgentConfig
+from agent.main_agent import DatabaseAgent
+
+
+class SlowReplies:
+    """Stand-in chat model whose batch call takes a fixed time."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batch_sizes = []
+        self.prompt_sizes = []
+
+    async def abatch(self, inputs, config=None, return_exceptions=False):
+        self.batch_sizes.append(len(inputs))
+        self.prompt_sizes.extend(len(messages) for messages in inputs)
+        await asyncio.sleep(self.delay)
+        return [AIMessage(content="Hi there!") for _ in inputs]
+
+
+def make_agent(replies):
+    """Build an agent on a fresh SQLite database with its replies served by `replies`."""
+    saved = config.DATABASE_URL, config.OPENROUTER_API_KEY
+    config.DATABASE_URL = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'agent.db')}"
+    config.OPENROUTER_API_KEY = config.OPENROUTER_API_KEY or "sk-test"
+    try:
+        agent = DatabaseAgent()
+    finally:
+        config.DATABASE_URL, config.OPENROUTER_API_KEY = saved
+    agent._response_batcher.runnable = replies
+    return agent
+
+
+def test_concurrent_replies_overlap():
+    """Test that a reply does not wait behind another conversation's reply call."""
+
+    print("🧪 Testing concurrent reply batches...")
+
+    replies = SlowReplies(delay=0.5)
+    agent = make_agent(replies)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        async def greet_at(offset, thread_id):
+            await asyncio.sleep(offset)
+            await agent.handle("hello", thread_id)
+            return loop.time() - start
+
+        return await asyncio.gather(greet_at(0, "a"), greet_at(0.1, "b"), greet_at(0.2, "c"))
+
+    finished = asyncio.run(run())
+    assert replies.batch_sizes == [1, 1, 1]
+    # Serialized reply batches would finish the later greetings after about 1.0 and 1.5 seconds
+    assert max(finished) < 0.9
+
+
+def test_long_thread_is_compacted():
+    """Test that a thread longer than HISTORY_MAX_MESSAGES is summarized and stays bounded."""
+
+    print("\n🧪 Testing history compaction...")
+
+    replies = SlowReplies()
+    agent = make_agent(replies)
+
+    async def run():
+        for _ in range(AgentConfig.HISTORY_MAX_MESSAGES):
+            await agent.handle("hello", "long")
+
+    asyncio.run(run())
+    messages = agent._get_thread_values("long")["messages"]
+
+    assert isinstance(messages[0], SystemMessage)
+    assert len(messages) <= AgentConfig.HISTORY_MAX_MESSAGES + 2
+    # System prompt, compacted history and the two messages of the new turn
+    assert max(replies.prompt_sizes) <= AgentConfig.HISTORY_MAX_MESSAGES + 3
+
+
+if __name__ == "__main__":
+    test_concurrent_replies_overlap()
+    test_long_thread_is_compacted()
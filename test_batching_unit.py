@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the LLM request batcher without requiring an LLM connection.
+"""
+
+import asyncio
+
+from agent.batching import LLMBatcher
+
+
+class RecordingRunnable:
+    """Stand-in runnable that doubles its inputs and records batch sizes."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    async def abatch(self, inputs, config=None, return_exceptions=False):
+        self.batch_sizes.append(len(inputs))
+        return [ValueError("bad input") if value < 0 else value * 2 for value in inputs]
+
+
+def test_concurrent_calls_share_one_batch():
+    """Test that calls submitted together are sent as a single abatch call."""
+
+    print("🧪 Testing concurrent call batching...")
+
+    runnable = RecordingRunnable()
+    batcher = LLMBatcher(runnable, max_batch_size=8, window=0.05)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(value) for value in range(5)))
+
+    assert asyncio.run(run()) == [0, 2, 4, 6, 8]
+    assert runnable.batch_sizes == [5]
+
+
+def test_batch_size_limit_and_errors():
+    """Test that batches are capped and each caller gets its own exception."""
+
+    print("\n🧪 Testing batch size limit and per-call errors...")
+
+    runnable = RecordingRunnable()
+    batcher = LLMBatcher(runnable, max_batch_size=2, window=0.05)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(value) for value in (1, -1, 3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert results[0] == 2 and results[2] == 6
+    assert isinstance(results[1], ValueError)
+    assert runnable.batch_sizes == [2, 1]
+
+    # A later event loop gets a fresh worker
+    assert asyncio.run(batcher.submit(4)) == 8
+
+
+
+class SlowRunnable:
+    """Stand-in runnable whose batch call takes a fixed time."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.batch_sizes = []
+
+    async def abatch(self, inputs, config=None, return_exceptions=False):
+        self.batch_sizes.append(len(inputs))
+        await asyncio.sleep(self.delay)
+        return list(inputs)
+
+
+def test_batches_overlap_in_time():
+    """Test that a batch starts while an earlier batch's call is still running."""
+
+    print("\n🧪 Testing overlapping batches...")
+
+    runnable = SlowRunnable(delay=0.5)
+    batcher = LLMBatcher(runnable, max_batch_size=8, window=0.02)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        async def submit_at(offset, value):
+            await asyncio.sleep(offset)
+            await batcher.submit(value)
+            return loop.time() - start
+
+        return await asyncio.gather(submit_at(0, "a"), submit_at(0.1, "b"), submit_at(0.2, "c"))
+
+    finished = asyncio.run(run())
+    assert runnable.batch_sizes == [1, 1, 1]
+    # Serialized batches would finish B and C after about 1.0 and 1.5 seconds
+    assert finished[1] < 0.9 and finished[2] < 0.9
+
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_batch()
+    test_batch_size_limit_and_errors()
+    test_batches_overlap_in_time()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the human approval manager without requiring database connection.
+"""
+
+from agent.human_approval import HumanApprovalManager
+
+
+def test_dangerous_operation_detection():
+    """Test that dangerous statements are detected from their leading opcode."""
+
+    print("🧪 Testing dangerous operation detection...")
+
+    manager = HumanApprovalManager()
+
+    test_cases = [
+        ("DROP TABLE users", True, "DROP"),
+        ("  delete from users where id = 1", True, "DELETE"),
+        ("\nALTER TABLE users ADD COLUMN age INTEGER", True, "ALTER"),
+        ("truncate table logs", True, "TRUNCATE"),
+        ("SELECT * FROM users", False, "UNKNOWN"),
+        ("INSERT INTO users (name) VALUES ('drop')", False, "UNKNOWN"),
+        ("", False, "UNKNOWN"),
+    ]
+
+    for sql_query, dangerous, operation_type in test_cases:
+        print(f"\n📝 Testing: '{sql_query}'")
+        assert manager.is_dangerous_operation(sql_query) is dangerous
+        assert manager.get_operation_type(sql_query) == operation_type
+
+
+def test_table_name_extraction():
+    """Test the table name extraction for dangerous statements."""
+
+    print("\n🧪 Testing table name extraction...")
+
+    manager = HumanApprovalManager()
+
+    test_cases = [
+        ("DROP TABLE users", "users"),
+        ("drop table if exists old_logs", "old_logs"),
+        ("DELETE FROM orders WHERE id = 3", "orders"),
+        ("ALTER TABLE customers ADD COLUMN phone TEXT", "customers"),
+        ("SELECT * FROM users", None),
+    ]
+
+    for sql_query, expected in test_cases:
+        print(f"\n📝 Testing: '{sql_query}'")
+        assert manager.extract_table_name(sql_query) == expected
+
+
+def test_approval_lifecycle():
+    """Test creating, approving and serializing an approval request."""
+
+    print("\n🧪 Testing approval lifecycle...")
+
+    manager = HumanApprovalManager()
+
+    result = manager.create_approval_request("DROP TABLE users", "DROP", "users")
+    approval_id = result["approval_id"]
+    assert result["approval_request"]["status"] == "pending"
+    assert isinstance(result["approval_request"]["expires_at"], str)
+
+    status = manager.get_approval_status(approval_id)
+    assert status["requires_approval"] is True
+
+    approved = manager.approve_operation(approval_id, approved_by="admin")
+    assert approved["success"] is True
+    assert approved["sql_query"] == "DROP TABLE users"
+
+    status = manager.get_approval_status(approval_id)
+    assert status["status"] == "approved"
+    assert status["approval_request"]["approved_by"] == "admin"
+    assert manager.get_pending_approvals()["count"] == 0
+
+
+def test_expired_approvals_cleanup():
+    """Test that expired approvals are evicted and decided ones are kept."""
+
+    print("\n🧪 Testing expired approval cleanup...")
+
+    manager = HumanApprovalManager()
+
+    approved_id = manager.create_approval_request("DROP TABLE temp", "DROP")["approval_id"]
+    manager.approve_operation(approved_id)
+
+    manager.approval_timeout = -1
+    expired_id = manager.create_approval_request("DELETE FROM logs", "DELETE")["approval_id"]
+
+    assert manager.cleanup_expired_approvals() == 1
+    assert manager.cleanup_expired_approvals() == 0
+    assert "error" in manager.get_approval_status(expired_id)
+    assert manager.approve_operation(expired_id)["success"] is False
+
+    assert manager.get_approval_status(approved_id)["status"] == "approved"
+    assert manager.get_pending_approvals()["count"] == 0
+
+
+if __name__ == "__main__":
+    test_dangerous_operation_detection()
+    test_table_name_extraction()
+    test_approval_lifecycle()
+    test_expired_approvals_cleanup()
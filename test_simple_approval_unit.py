@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the simple approval manager without requiring database connection.
+"""
+
+from agent.simple_approval import SimpleApprovalManager
+
+
+def test_dangerous_operation_detection():
+    """Test that safe and dangerous statements are classified by their leading clause."""
+
+    print("🧪 Testing dangerous operation detection...")
+
+    manager = SimpleApprovalManager()
+
+    test_cases = [
+        ("DROP TABLE users", True),
+        ("  \n delete from users where id = 1", True),
+        ("ALTER TABLE users ADD COLUMN age INTEGER", True),
+        ("truncate table logs", True),
+        ("UPDATE users SET active = 0 WHERE 1 = 1", True),
+        ("UPDATE users SET active = 0 WHERE id = 2", False),
+        ("SELECT * FROM users", False),
+        ("INSERT INTO users (name) VALUES ('drop')", False),
+        ("", False),
+        ("   ", False),
+    ]
+
+    for sql_query, dangerous in test_cases:
+        print(f"\n📝 Testing: '{sql_query}'")
+        assert manager.is_dangerous_operation(sql_query) is dangerous
+
+
+def test_operation_info():
+    """Test operation type and table name extraction for dangerous statements."""
+
+    print("🧪 Testing operation info extraction...")
+
+    manager = SimpleApprovalManager()
+
+    test_cases = [
+        ("DROP TABLE IF EXISTS users", "DROP", "users"),
+        ("  delete from orders where id = 3", "DELETE", "orders"),
+        ("ALTER TABLE customers ADD COLUMN phone TEXT", "ALTER", "customers"),
+        ("truncate table logs", "TRUNCATE", "logs"),
+        ("UPDATE accounts SET active = 0 WHERE 1=1", "UPDATE", "accounts"),
+        ("SELECT * FROM users", "UNKNOWN", None),
+    ]
+
+    for sql_query, operation_type, table_name in test_cases:
+        print(f"\n📝 Testing: '{sql_query}'")
+        info = manager.get_operation_info(sql_query)
+        assert info["operation_type"] == operation_type
+        assert info["table_name"] == table_name
+
+
+def test_expired_approvals_cleanup():
+    """Test that only expired approvals are evicted by cleanup."""
+
+    print("\n🧪 Testing expired approval cleanup...")
+
+    manager = SimpleApprovalManager()
+
+    live_id = manager.create_approval_request("DROP TABLE temp")["approval_id"]
+
+    manager.timeout_seconds = -1
+    expired_id = manager.create_approval_request("DELETE FROM logs")["approval_id"]
+
+    assert manager.cleanup_expired_approvals() == 1
+    assert manager.cleanup_expired_approvals() == 0
+    assert "error" in manager.get_approval_status(expired_id)
+
+    assert manager.get_pending_approvals()["count"] == 1
+    assert manager.approve_operation(live_id)["success"] is True
+    assert manager.get_pending_approvals()["count"] == 0
+
+    manager.timeout_seconds = 300
+    first_id = manager.create_approval_request("DROP TABLE a")["approval_id"]
+    second_id = manager.create_approval_request("DROP TABLE b")["approval_id"]
+    for approval in manager.iter_pending_approvals(limit=1):
+        assert approval.id == first_id
+        manager.approve_operation(approval.id)
+    assert [approval.id for approval in manager.iter_pending_approvals()] == [second_id]
+    manager.deny_operation(second_id)
+
+    denied_id = manager.create_approval_request("DROP TABLE other")["approval_id"]
+    assert manager.deny_operation(denied_id, denied_by="admin")["success"] is True
+    record = manager.get_approval_status(denied_id)["approval_request"]
+    assert record["denied_by"] == "admin" and record["approved_by"] is None
+
+
+if __name__ == "__main__":
+    test_dangerous_operation_detection()
+    test_operation_info()
+    test_expired_approvals_cleanup()
@@ -4,6 +4,7 @@ Test script to verify the table creation fix works correctly.
 
 import sys
 import os
+import asyncio
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from agent.main_agent import DatabaseAgent
@@ -26,20 +27,26 @@ def test_table_name_extraction():
             "database name customer with columns id, name, email, phone"
         ]
         
-        for test_case in test_cases:
-            print(f"\n📝 Testing: '{test_case}'")
-            try:
-                # Test the table name extraction
-                table_names = agent._extract_table_names_from_query(test_case)
-                print(f"✅ Extracted table names: {table_names}")
+        async def extract_all():
+            # One event loop for every case, so the agent's async HTTP pool stays usable
+            for test_case in test_cases:
+                print(f"\n📝 Testing: '{test_case}'")
+                try:
+                    # Test the table name extraction
+                    table_names = await agent._extract_table_names_from_query(test_case)
+                    print(f"✅ Extracted table names: {table_names}")
                 
-                if table_names:
-                    print(f"   → Table to create: {table_names[0]}")
-                else:
-                    print("   ❌ No table names extracted")
+                    if table_names:
+                        print(f"   → Table to create: {table_names[0]}")
+                    else:
+                        print("   ❌ No table names extracted")
                     
-            except Exception as e:
-                print(f"   ❌ Error: {e}")
+                except Exception as e:
+                    print(f"   ❌ Error: {e}")
+        
+            await agent.aclose()
+        
+        asyncio.run(extract_all())
         
         print("\n🎉 Table name extraction test completed!")
         